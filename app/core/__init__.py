@@ -1 +1 @@
-"""Core module - data models and schemas."""
+"""Core module - data models, schemas and shared helpers."""
@@ -0,0 +1,58 @@
+"""
+Helpers for "HH:MM" time strings.
+
+The domain is tiny (00:00 - 24:00), so lookup tables are built once at
+import and conversions on hot paths become plain dict lookups.
+"""
+
+# "HH:MM" -> minutes since midnight ("24:00" marks end of day)
+MINUTES: dict[str, int] = {
+    f"{h:02d}:{m:02d}": h * 60 + m for h in range(24) for m in range(60)
+}
+MINUTES["24:00"] = 24 * 60
+
+# Minutes since midnight -> "HH:MM" (index 0 - 1440)
+_TIMES: list[str] = list(MINUTES)
+
+# Unpadded and padded spellings -> canonical "HH:MM"
+_NORMALIZED: dict[str, str] = {
+    f"{h}:{m:02d}": f"{h:02d}:{m:02d}" for h in range(25) for m in range(60)
+} | {padded: padded for padded in MINUTES}
+
+
+def to_minutes(time_str: str) -> int:
+    """Convert HH:MM to minutes."""
+    minutes = MINUTES.get(time_str)
+    if minutes is None:
+        h, _, m = time_str.partition(":")
+        minutes = int(h) * 60 + int(m or 0)
+    return minutes
+
+
+def format_minutes(minutes: int) -> str:
+    """Convert minutes to HH:MM (e.g., 450 -> 07:30)."""
+    if 0 <= minutes <= 24 * 60:
+        return _TIMES[minutes]
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def normalize_time(time_str: str) -> str:
+    """Normalize time to HH:MM format (e.g., 7:00 -> 07:00)."""
+    normalized = _NORMALIZED.get(time_str)
+    if normalized is None:
+        h, _, m = time_str.partition(":")
+        normalized = f"{int(h):02d}:{int(m or 0):02d}"
+    return normalized
+
+
+def duration_minutes(start: str, end: str) -> int:
+    """
+    Get interval length in minutes.
+    
+    An end at or before the start is treated as an overnight interval
+    (e.g., 23:00 to 02:00 is 180 minutes).
+    """
+    start_min, end_min = to_minutes(start), to_minutes(end)
+    if end_min > start_min:
+        return end_min - start_min
+    return 24 * 60 - start_min + end_min
@@ -2,12 +2,73 @@
 Database module for Khmelnytskyi Outage API.
 
 Manages SQLite database with outage schedules and operational messages.
-Uses separate connection per request for thread-safety with FastAPI.
+Uses a small pool of reusable connections shared by FastAPI worker threads.
 """
 
+import itertools
+import queue
 import sqlite3
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional, TypeVar, cast
+
+from app.core.timeutils import duration_minutes, to_minutes
+
+T = TypeVar("T")
+
+# Schema (tables and indexes), applied on startup
+_SCHEMA_SQL = """
+    -- Queue names dictionary (1.1 - 6.2)
+    CREATE TABLE IF NOT EXISTS queues (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL
+    );
+    
+    -- Outage intervals
+    CREATE TABLE IF NOT EXISTS schedules (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        queue_id INTEGER NOT NULL,
+        day_date TEXT NOT NULL,
+        start_time INTEGER NOT NULL,  -- minutes since midnight
+        end_time INTEGER NOT NULL,    -- minutes since midnight (1440 = 24:00)
+        type TEXT DEFAULT 'base',
+        FOREIGN KEY (queue_id) REFERENCES queues(id)
+    );
+    
+    -- Total outage minutes per queue/date, precomputed on write
+    CREATE TABLE IF NOT EXISTS schedule_totals (
+        queue_id INTEGER NOT NULL,
+        day_date TEXT NOT NULL,
+        total_minutes INTEGER NOT NULL,
+        PRIMARY KEY (queue_id, day_date),
+        FOREIGN KEY (queue_id) REFERENCES queues(id)
+    );
+    
+    -- Operational messages (one per date, for all queues)
+    CREATE TABLE IF NOT EXISTS daily_messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        day_date TEXT UNIQUE NOT NULL,
+        message TEXT NOT NULL
+    );
+    
+    -- System metadata
+    CREATE TABLE IF NOT EXISTS metadata (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    
+    -- Composite indexes cover filter + ORDER BY start_time (no temp sort)
+    DROP INDEX IF EXISTS idx_schedules_date;
+    DROP INDEX IF EXISTS idx_schedules_queue_date;
+    CREATE INDEX IF NOT EXISTS idx_schedules_qdate_start
+        ON schedules(queue_id, day_date, start_time);
+    CREATE INDEX IF NOT EXISTS idx_schedules_date_start
+        ON schedules(day_date, start_time);
+"""
 
 
 class Database:
@@ -17,68 +78,181 @@ class Database:
     Tables:
         - queues: Queue names (1.1 - 6.2)
         - schedules: Outage intervals per queue/date
+        - schedule_totals: Total outage minutes per queue/date (derived on write)
         - daily_messages: Operational messages per date (general, not per-queue)
         - metadata: System metadata (last_updated, etc.)
     
     Thread Safety:
-        Creates a new connection for each operation to ensure thread safety
-        when used with FastAPI's async request handling.
+        Connections are pre-opened into a bounded pool and checked out
+        per operation, so each connection is used by one thread at a time.
+        Writes are additionally serialized with a lock, since SQLite
+        allows only one writer anyway.
+    
+    Caching:
+        Reads are cached in-process for CACHE_TTL seconds (at most
+        CACHE_MAX_ENTRIES keys) and invalidated on every write.
     """
     
-    def __init__(self, db_path: str = "outages.db") -> None:
+    CACHE_TTL = 60
+    CACHE_MAX_ENTRIES = 512
+    SCHEMA_VERSION = 2
+    
+    _memory_ids = itertools.count()
+    
+    def __init__(self, db_path: str = "outages.db", pool_size: int = 8) -> None:
         """
         Initialize database.
         
         Args:
-            db_path: Path to SQLite database file.
+            db_path: Path to SQLite database file, or ":memory:" for a
+                private in-memory database (kept while the pool is open).
+            pool_size: Number of pooled connections.
         """
         self.db_path = db_path
+        # Pooled connections must all see the same in-memory database
+        self._uri = db_path == ":memory:"
+        self._target = (
+            f"file:outages-memdb-{next(self._memory_ids)}?mode=memory&cache=shared"
+            if self._uri else db_path
+        )
+        self._pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=pool_size)
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._cache: dict[tuple, tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
         self._init_db()
     
     def _connect(self) -> sqlite3.Connection:
-        """Create a new connection (thread-safe for FastAPI)."""
-        conn = sqlite3.connect(self.db_path)
+        """Open a new pooled connection with tuned pragmas."""
+        # Autocommit mode: transactions are opened explicitly (see transaction)
+        conn = sqlite3.connect(
+            self._target, check_same_thread=False, isolation_level=None, uri=self._uri
+        )
         conn.row_factory = sqlite3.Row
+        conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-64000;
+            PRAGMA mmap_size=67108864;
+        """)
         return conn
     
+    @contextmanager
+    def _acquire(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection from the pool and return it afterwards."""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a write transaction on a pooled connection.
+        
+        BEGIN IMMEDIATE takes SQLite's write lock up front, so the
+        transaction can't fail with SQLITE_BUSY halfway through.
+        Nested calls from the same thread join the outer transaction,
+        so several save_schedule() calls can share one commit.
+        
+        Example:
+            >>> with db.transaction():
+            ...     db.save_schedule("2026-01-15", schedules)
+            ...     db.save_schedule("2026-01-16", schedules)
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        
+        with self._write_lock, self._acquire() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.conn = conn
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._local.conn = None
+            conn.execute("COMMIT")
+        self._invalidate_cache()
+    
+    def _cached(self, key: tuple, loader: Callable[[], T]) -> T:
+        """
+        Return cached value for key, calling loader on miss or expiry.
+        
+        Values loaded concurrently with a write are not stored, so an
+        invalidation can't be overwritten by pre-write data.
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            generation = self._cache_generation
+        if entry and now - entry[0] < self.CACHE_TTL:
+            return cast(T, entry[1])
+        
+        value = loader()
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                if key not in self._cache and len(self._cache) >= self.CACHE_MAX_ENTRIES:
+                    del self._cache[next(iter(self._cache))]  # oldest insertion
+                self._cache[key] = (now, value)
+        return value
+    
+    def cached(self, key: tuple, loader: Callable[[], T]) -> T:
+        """
+        Cache a value derived from database reads (e.g., a rendered response).
+        
+        Shares the read cache's TTL, size bound and write invalidation.
+        
+        Args:
+            key: Cache key, namespaced away from the internal read keys
+            loader: Called on miss to build the value
+        """
+        return self._cached(("derived",) + key, loader)
+    
+    def get_cached(self, key: tuple) -> Any:
+        """
+        Return a fresh value stored by cached(), or None; never queries.
+        
+        Lets async callers serve hits inline and move only misses off the
+        event loop.
+        
+        Args:
+            key: Cache key as passed to cached()
+        """
+        with self._cache_lock:
+            entry = self._cache.get(("derived",) + key)
+        if entry and time.monotonic() - entry[0] < self.CACHE_TTL:
+            return entry[1]
+        return None
+    
+    def _invalidate_cache(self) -> None:
+        """Drop all cached reads (called after writes)."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_generation += 1
+    
+    def close(self) -> None:
+        """Close all pooled connections."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+    
     def _init_db(self) -> None:
         """Initialize database schema."""
-        with self._connect() as conn:
-            conn.executescript("""
-                -- Queue names dictionary (1.1 - 6.2)
-                CREATE TABLE IF NOT EXISTS queues (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL
-                );
-                
-                -- Outage intervals
-                CREATE TABLE IF NOT EXISTS schedules (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    queue_id INTEGER NOT NULL,
-                    day_date TEXT NOT NULL,
-                    start_time TEXT NOT NULL,
-                    end_time TEXT NOT NULL,
-                    type TEXT DEFAULT 'base',
-                    FOREIGN KEY (queue_id) REFERENCES queues(id)
-                );
-                
-                -- Operational messages (one per date, for all queues)
-                CREATE TABLE IF NOT EXISTS daily_messages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    day_date TEXT UNIQUE NOT NULL,
-                    message TEXT NOT NULL
-                );
-                
-                -- System metadata
-                CREATE TABLE IF NOT EXISTS metadata (
-                    key TEXT PRIMARY KEY,
-                    value TEXT
-                );
-                
-                -- Indexes for fast lookups
-                CREATE INDEX IF NOT EXISTS idx_schedules_date ON schedules(day_date);
-                CREATE INDEX IF NOT EXISTS idx_schedules_queue_date ON schedules(queue_id, day_date);
-            """)
+        with self.transaction() as conn:
+            self._apply_schema(conn)
             
             # Seed default queues (1.1 - 6.2)
             queues = [f"{i}.{j}" for i in range(1, 7) for j in range(1, 3)]
@@ -86,7 +260,61 @@ class Database:
                 "INSERT OR IGNORE INTO queues (name) VALUES (?)",
                 [(q,) for q in queues]
             )
-            conn.commit()
+            
+            self._migrate(conn)
+            
+            # Queues are static after seeding, so resolve name -> id once
+            self._queue_ids = {
+                row["name"]: row["id"]
+                for row in conn.execute("SELECT name, id FROM queues")
+            }
+    
+    def _apply_schema(self, conn: sqlite3.Connection) -> None:
+        """Create missing tables and indexes (safe inside a transaction)."""
+        for statement in _SCHEMA_SQL.split(";"):
+            if statement.strip():
+                conn.execute(statement)
+    
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Bring data created by older versions up to SCHEMA_VERSION."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        
+        if version < 1:
+            # Backfill totals for schedules saved before schedule_totals existed
+            totals: dict[tuple[int, str], int] = defaultdict(int)
+            for row in conn.execute(
+                "SELECT queue_id, day_date, start_time, end_time FROM schedules"
+            ):
+                totals[(row["queue_id"], row["day_date"])] += duration_minutes(
+                    row["start_time"], row["end_time"]
+                )
+            conn.executemany(
+                """INSERT INTO schedule_totals (queue_id, day_date, total_minutes) VALUES (?, ?, ?)
+                   ON CONFLICT (queue_id, day_date) DO UPDATE SET total_minutes = excluded.total_minutes""",
+                [(queue_id, date, total) for (queue_id, date), total in totals.items()]
+            )
+        
+        if version < 2:
+            # Times used to be stored as "HH:MM" text; rebuild with integer minutes
+            columns = {row["name"]: row["type"] for row in conn.execute("PRAGMA table_info(schedules)")}
+            if columns["start_time"] == "TEXT":
+                conn.execute("ALTER TABLE schedules RENAME TO schedules_text")
+                conn.execute("DROP INDEX idx_schedules_qdate_start")
+                conn.execute("DROP INDEX idx_schedules_date_start")
+                self._apply_schema(conn)
+                conn.execute("""
+                    INSERT INTO schedules (id, queue_id, day_date, start_time, end_time, type)
+                    SELECT id, queue_id, day_date,
+                           CAST(substr(start_time, 1, instr(start_time, ':') - 1) AS INTEGER) * 60
+                               + CAST(substr(start_time, instr(start_time, ':') + 1) AS INTEGER),
+                           CAST(substr(end_time, 1, instr(end_time, ':') - 1) AS INTEGER) * 60
+                               + CAST(substr(end_time, instr(end_time, ':') + 1) AS INTEGER),
+                           type
+                    FROM schedules_text
+                """)
+                conn.execute("DROP TABLE schedules_text")
+        
+        conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
     
     def save_schedule(
         self,
@@ -102,38 +330,77 @@ class Database:
             schedules: Dict {queue: [{"start": "HH:MM", "end": "HH:MM", "type": "base"}]}
             message: Optional operational message for the date
         """
-        with self._connect() as conn:
-            # Clear old data for this date
-            conn.execute("DELETE FROM schedules WHERE day_date = ?", (date,))
-            conn.execute("DELETE FROM daily_messages WHERE day_date = ?", (date,))
+        self.save_bulk({date: schedules}, {date: message})
+    
+    def save_bulk(
+        self,
+        schedules: dict[str, dict],
+        messages: Optional[dict[str, Optional[str]]] = None
+    ) -> None:
+        """
+        Save schedules for several dates with one executemany per table.
+        
+        Existing data for each date is replaced. All dates are written
+        in a single transaction.
+        
+        Args:
+            schedules: Dict {date: {queue: [{"start": ..., "end": ..., "type": ...}]}}
+            messages: Optional dict {date: operational message}
+        """
+        dates = [(date,) for date in schedules]
+        messages = messages or {}
+        
+        with self.transaction() as conn:
+            # Clear old data for these dates
+            conn.executemany("DELETE FROM schedules WHERE day_date = ?", dates)
+            conn.executemany("DELETE FROM schedule_totals WHERE day_date = ?", dates)
+            conn.executemany("DELETE FROM daily_messages WHERE day_date = ?", dates)
             
-            # Insert schedules
-            for queue_name, intervals in schedules.items():
-                for interval in intervals:
-                    conn.execute(
-                        """INSERT INTO schedules (queue_id, day_date, start_time, end_time, type)
-                           VALUES ((SELECT id FROM queues WHERE name = ?), ?, ?, ?, ?)""",
-                        (queue_name, date, interval["start"], interval["end"], 
-                         interval.get("type", "base"))
-                    )
+            # Insert schedules (unknown queue names are skipped)
+            conn.executemany(
+                """INSERT INTO schedules (queue_id, day_date, start_time, end_time, type)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (
+                    (self._queue_ids[queue_name], date,
+                     to_minutes(interval["start"]), to_minutes(interval["end"]),
+                     interval.get("type", "base"))
+                    for date, queues in schedules.items()
+                    for queue_name, intervals in queues.items()
+                    if queue_name in self._queue_ids
+                    for interval in intervals
+                )
+            )
+            conn.executemany(
+                "INSERT INTO schedule_totals (queue_id, day_date, total_minutes) VALUES (?, ?, ?)",
+                (
+                    (self._queue_ids[queue_name], date,
+                     sum(duration_minutes(i["start"], i["end"]) for i in intervals))
+                    for date, queues in schedules.items()
+                    for queue_name, intervals in queues.items()
+                    if queue_name in self._queue_ids
+                )
+            )
             
-            # Insert operational message
-            if message and message.strip():
-                conn.execute(
-                    "INSERT INTO daily_messages (day_date, message) VALUES (?, ?)",
+            # Insert operational messages
+            conn.executemany(
+                "INSERT INTO daily_messages (day_date, message) VALUES (?, ?)",
+                (
                     (date, message.strip())
+                    for date, message in messages.items()
+                    if date in schedules and message and message.strip()
                 )
+            )
             
             # Update last_updated timestamp
             conn.execute(
-                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                """INSERT INTO metadata (key, value) VALUES (?, ?)
+                   ON CONFLICT (key) DO UPDATE SET value = excluded.value""",
                 ("last_updated", datetime.now().isoformat())
             )
-            conn.commit()
     
     def get_schedule(self, queue: str, date: str) -> list[dict]:
         """
-        Get schedule intervals for a queue on a specific date.
+        Get schedule intervals for a queue on a date (cached, do not mutate the result).
         
         Args:
             queue: Queue name (e.g., "3.1")
@@ -142,15 +409,22 @@ class Database:
         Returns:
             List of dicts with start_time, end_time, type keys.
         """
-        with self._connect() as conn:
+        return self._cached(("schedule", queue, date), lambda: self._query_schedule(queue, date))
+    
+    def _query_schedule(self, queue: str, date: str) -> list[dict]:
+        """Query schedule intervals from the database."""
+        with self._acquire() as conn:
             cursor = conn.execute(
-                """SELECT start_time, end_time, type FROM schedules
+                """SELECT printf('%02d:%02d', start_time / 60, start_time % 60) AS start_time,
+                          printf('%02d:%02d', end_time / 60, end_time % 60) AS end_time,
+                          type
+                   FROM schedules
                    JOIN queues ON schedules.queue_id = queues.id
                    WHERE queues.name = ? AND day_date = ?
-                   ORDER BY start_time""",
+                   ORDER BY schedules.start_time""",
                 (queue, date)
             )
-            return [dict(row) for row in cursor.fetchall()]
+            return [dict(row) for row in cursor]
     
     def get_all_schedules(self, date: str) -> dict[str, list[dict]]:
         """
@@ -162,31 +436,135 @@ class Database:
         Returns:
             Dict mapping queue names to lists of intervals.
         """
-        with self._connect() as conn:
+        with self._acquire() as conn:
             cursor = conn.execute(
-                """SELECT queues.name as queue, start_time, end_time, type
+                """SELECT queues.name as queue,
+                          printf('%02d:%02d', start_time / 60, start_time % 60) AS start_time,
+                          printf('%02d:%02d', end_time / 60, end_time % 60) AS end_time,
+                          type
                    FROM schedules
                    JOIN queues ON schedules.queue_id = queues.id
                    WHERE day_date = ?
-                   ORDER BY queues.name, start_time""",
+                   ORDER BY queues.name, schedules.start_time""",
                 (date,)
             )
             
-            result = {}
-            for row in cursor.fetchall():
-                queue = row["queue"]
-                if queue not in result:
-                    result[queue] = []
-                result[queue].append({
+            result = defaultdict(list)
+            for row in cursor:
+                result[row["queue"]].append({
                     "start_time": row["start_time"],
                     "end_time": row["end_time"],
                     "type": row["type"]
                 })
-            return result
+            return dict(result)
+    
+    def get_schedule_bundle(self, queue: str, date: str) -> dict:
+        """
+        Get everything the single-queue view needs for a date in one query.
+        
+        Intervals, the precomputed total, the operational message and
+        last_updated come from a single statement (the latter three are
+        scalar subqueries). Not cached here: the API caches the rendered
+        response body instead, so one cache entry serves each request.
+        
+        Args:
+            queue: Queue name (e.g., "3.1")
+            date: Date in YYYY-MM-DD format
+        
+        Returns:
+            {"queue": ..., "date": ..., "status": "active" | "no_data",
+             "intervals": [{"start": ..., "end": ..., "type": ...}],
+             "operational_message": ..., "last_updated": ..., "total_hours_off": 5.0}
+        """
+        with self._acquire() as conn:
+            cursor = conn.execute(
+                """SELECT schedules.id,
+                          printf('%02d:%02d', start_time / 60, start_time % 60) AS start_time,
+                          printf('%02d:%02d', end_time / 60, end_time % 60) AS end_time,
+                          type,
+                          (SELECT total_minutes FROM schedule_totals
+                           WHERE queue_id = :queue_id AND day_date = :date) AS total_minutes,
+                          (SELECT message FROM daily_messages WHERE day_date = :date) AS message,
+                          (SELECT value FROM metadata WHERE key = 'last_updated') AS last_updated
+                   FROM (SELECT 1)
+                   LEFT JOIN schedules
+                       ON schedules.queue_id = :queue_id AND schedules.day_date = :date
+                   ORDER BY schedules.start_time""",
+                {"queue_id": self._queue_ids.get(queue), "date": date}
+            )
+            
+            intervals = []
+            for row in cursor:
+                if row["id"] is not None:  # NULL row: no schedule for the date
+                    intervals.append({
+                        "start": row["start_time"], "end": row["end_time"], "type": row["type"]
+                    })
+            return {
+                "queue": queue,
+                "date": date,
+                "status": "active" if intervals else "no_data",
+                "intervals": intervals,
+                "operational_message": row["message"],
+                "last_updated": row["last_updated"],
+                "total_hours_off": round((row["total_minutes"] or 0) / 60, 1),
+            }
+    
+    def get_day_bundle(self, date: str) -> dict:
+        """
+        Get everything the all-queues view needs for a date in one query.
+        
+        Schedules, totals, the operational message and last_updated are
+        fetched with a single statement (message and last_updated are
+        scalar subqueries, so they are evaluated once). Not cached here:
+        the API caches the rendered response body instead.
+        
+        Args:
+            date: Date in YYYY-MM-DD format
+        
+        Returns:
+            {"date": ..., "last_updated": ..., "operational_message": ...,
+             "queues": {"1.1": {"intervals": [...], "total_hours_off": 5.0}, ...}}
+        """
+        with self._acquire() as conn:
+            cursor = conn.execute(
+                """SELECT queues.name AS queue,
+                          printf('%02d:%02d', start_time / 60, start_time % 60) AS start_time,
+                          printf('%02d:%02d', end_time / 60, end_time % 60) AS end_time,
+                          type, total_minutes,
+                          (SELECT message FROM daily_messages WHERE day_date = :date) AS message,
+                          (SELECT value FROM metadata WHERE key = 'last_updated') AS last_updated
+                   FROM (SELECT 1)
+                   LEFT JOIN schedules ON schedules.day_date = :date
+                   LEFT JOIN queues ON schedules.queue_id = queues.id
+                   LEFT JOIN schedule_totals
+                       ON schedule_totals.queue_id = schedules.queue_id
+                       AND schedule_totals.day_date = schedules.day_date
+                   ORDER BY queues.name, schedules.start_time""",
+                {"date": date}
+            )
+            
+            bundle: dict = {"date": date, "last_updated": None,
+                            "operational_message": None, "queues": {}}
+            queues = bundle["queues"]
+            for row in cursor:
+                bundle["last_updated"] = row["last_updated"]
+                bundle["operational_message"] = row["message"]
+                queue = row["queue"]
+                if queue is None:
+                    continue  # date without schedules: single row of NULLs
+                if queue not in queues:
+                    queues[queue] = {
+                        "intervals": [],
+                        "total_hours_off": round((row["total_minutes"] or 0) / 60, 1)
+                    }
+                queues[queue]["intervals"].append({
+                    "start": row["start_time"], "end": row["end_time"], "type": row["type"]
+                })
+            return bundle
     
     def get_message(self, date: str) -> Optional[str]:
         """
-        Get operational message for a date.
+        Get operational message for a date (cached).
         
         Args:
             date: Date in YYYY-MM-DD format
@@ -194,7 +572,11 @@ class Database:
         Returns:
             Message text or None if not found.
         """
-        with self._connect() as conn:
+        return self._cached(("message", date), lambda: self._query_message(date))
+    
+    def _query_message(self, date: str) -> Optional[str]:
+        """Query operational message from the database."""
+        with self._acquire() as conn:
             cursor = conn.execute(
                 "SELECT message FROM daily_messages WHERE day_date = ?",
                 (date,)
@@ -204,20 +586,24 @@ class Database:
     
     def get_dates(self) -> list[str]:
         """
-        Get list of available dates.
+        Get list of available dates (cached, do not mutate the result).
         
         Returns:
             List of dates in YYYY-MM-DD format, sorted descending.
         """
-        with self._connect() as conn:
+        return self._cached(("dates",), self._query_dates)
+    
+    def _query_dates(self) -> list[str]:
+        """Query available dates from the database."""
+        with self._acquire() as conn:
             cursor = conn.execute(
                 "SELECT DISTINCT day_date FROM schedules ORDER BY day_date DESC"
             )
-            return [row["day_date"] for row in cursor.fetchall()]
+            return [row["day_date"] for row in cursor]
     
     def get_metadata(self, key: str) -> Optional[str]:
         """
-        Get metadata value by key.
+        Get metadata value by key (cached).
         
         Args:
             key: Metadata key (e.g., "last_updated")
@@ -225,7 +611,11 @@ class Database:
         Returns:
             Value or None if not found.
         """
-        with self._connect() as conn:
+        return self._cached(("metadata", key), lambda: self._query_metadata(key))
+    
+    def _query_metadata(self, key: str) -> Optional[str]:
+        """Query metadata value from the database."""
+        with self._acquire() as conn:
             cursor = conn.execute(
                 "SELECT value FROM metadata WHERE key = ?", (key,)
             )
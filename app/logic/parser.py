@@ -8,6 +8,8 @@ Handles operational changes (earlier start, extended end, etc.).
 import re
 from typing import Optional
 
+from app.core.timeutils import format_minutes, normalize_time, to_minutes
+
 
 class Parser:
     """
@@ -24,6 +26,37 @@ class Parser:
     # Time interval pattern: "з HH:MM до HH:MM"
     TIME_PATTERN = re.compile(r'з\s*(\d{1,2}:\d{2})\s*до\s*(\d{1,2}:\d{2})')
     
+    # Whole base schedule line containing "підчерга 1.1 – ..."
+    QUEUE_LINE_PATTERN = re.compile(
+        r'^[^\n]*?підчерга[^\S\n]+(\d\.\d)[^\n]*', re.IGNORECASE | re.MULTILINE
+    )
+    
+    # En/em dashes -> "-" (single-pass str.translate table)
+    DASH_TABLE = str.maketrans({"–": "-", "—": "-"})
+    
+    # Operational changes: entry separator and queue lists ("підчерги 1.1, 2.2")
+    SPLIT_PATTERN = re.compile(r'[;.,:]?\s*-\s*(?=у\s+підчерг|підчерг[иуа])')
+    QUEUE_LIST_PATTERN = re.compile(r'підчерг[иуа]?\s+([\d\.\s,]+)', re.IGNORECASE)
+    QUEUE_NUM_PATTERN = re.compile(r'(\d\.\d)')
+    
+    # Every change kind below contains one of these words
+    CHANGE_KEYWORD_PATTERN = re.compile(r'раніше|довше|додатково', re.IGNORECASE)
+    
+    # Change kinds, checked in this order (see _apply_changes)
+    FULL_CHANGE_PATTERN = re.compile(
+        r'раніше\s*-?\s*о[б]?\s*(\d{1,2}:\d{2}).+?триватиме\s+до\s*(\d{1,2}:\d{2})',
+        re.IGNORECASE
+    )
+    EARLY_START_PATTERN = re.compile(
+        r'розпочнеться\s+раніше\s*-?\s*о[б]?\s*(\d{1,2}:\d{2})', re.IGNORECASE
+    )
+    EXTENDED_END_PATTERN = re.compile(
+        r'триватиме\s+довше\s*-?\s*(?:до|заживлення.+?о[б]?)\s*(\d{1,2}:\d{2})', re.IGNORECASE
+    )
+    EXTRA_PATTERN = re.compile(
+        r'додатково.+?з\s*(\d{1,2}:\d{2})\s*до\s*(\d{1,2}:\d{2})', re.IGNORECASE
+    )
+    
     def parse_block(self, block: dict) -> dict:
         """
         Parse a schedule block for a specific date.
@@ -36,17 +69,14 @@ class Parser:
         """
         queues = {}
         
-        # Parse base schedule
-        for line in block.get("schedule_text", "").split("\n"):
-            match = re.search(r'підчерга\s+(\d\.\d)', line, re.IGNORECASE)
-            if match:
-                queue = match.group(1)
-                intervals = [
-                    {"start": self._normalize_time(s), "end": self._normalize_time(e), "type": "base"}
-                    for s, e in self.TIME_PATTERN.findall(line)
-                ]
-                if intervals:
-                    queues[queue] = intervals
+        # Parse base schedule (one pass over the block, one match per queue line)
+        for match in self.QUEUE_LINE_PATTERN.finditer(block.get("schedule_text", "")):
+            intervals = [
+                {"start": normalize_time(s), "end": normalize_time(e), "type": "base"}
+                for s, e in self.TIME_PATTERN.findall(match.group(0))
+            ]
+            if intervals:
+                queues[match.group(1)] = intervals
         
         # Parse and apply operational changes
         extras_text = block.get("extras_text", "")
@@ -59,17 +89,15 @@ class Parser:
             "message": extras_text if extras_text else None
         }
     
-    def _normalize_time(self, time_str: str) -> str:
-        """Normalize time to HH:MM format (e.g., 7:00 -> 07:00)."""
-        parts = time_str.split(":")
-        return f"{parts[0].zfill(2)}:{parts[1].zfill(2)}"
-    
     def _apply_changes(self, extras_text: str, queues: dict) -> None:
         """Apply operational changes to queue schedules."""
-        text = extras_text.replace("–", "-").replace("—", "-")
+        if not self.CHANGE_KEYWORD_PATTERN.search(extras_text):
+            return
+        
+        text = extras_text.translate(self.DASH_TABLE)
         
         # Split into separate entries
-        entries = re.split(r'[;.,:]?\s*-\s*(?=у\s+підчерг|підчерг[иуа])', text)
+        entries = self.SPLIT_PATTERN.split(text)
         processed = set()
         
         for entry in entries:
@@ -78,21 +106,18 @@ class Parser:
                 continue
             
             # Extract queue numbers
-            queue_matches = re.findall(r'підчерг[иуа]?\s+([\d\.\s,]+)', entry, re.IGNORECASE)
+            queue_matches = self.QUEUE_LIST_PATTERN.findall(entry)
             queue_nums = []
             for qm in queue_matches:
-                queue_nums.extend(re.findall(r'(\d\.\d)', qm))
+                queue_nums.extend(self.QUEUE_NUM_PATTERN.findall(qm))
             
             if not queue_nums:
                 continue
             
             # Pattern 1: Full change "раніше – об 11:00 і триватиме до 16:00"
-            match = re.search(
-                r'раніше\s*-?\s*о[б]?\s*(\d{1,2}:\d{2}).+?триватиме\s+до\s*(\d{1,2}:\d{2})',
-                entry, re.IGNORECASE
-            )
+            match = self.FULL_CHANGE_PATTERN.search(entry)
             if match:
-                start, end = self._normalize_time(match.group(1)), self._normalize_time(match.group(2))
+                start, end = normalize_time(match.group(1)), normalize_time(match.group(2))
                 for q in queue_nums:
                     if f"{q}_full" not in processed:
                         queues.setdefault(q, []).append({"start": start, "end": end, "type": "change"})
@@ -100,9 +125,9 @@ class Parser:
                 continue
             
             # Pattern 2: Earlier start "розпочнеться раніше – о 20:00"
-            match = re.search(r'розпочнеться\s+раніше\s*-?\s*о[б]?\s*(\d{1,2}:\d{2})', entry, re.IGNORECASE)
+            match = self.EARLY_START_PATTERN.search(entry)
             if match:
-                new_start = self._normalize_time(match.group(1))
+                new_start = normalize_time(match.group(1))
                 for q in queue_nums:
                     if f"{q}_start" not in processed and f"{q}_full" not in processed:
                         queues.setdefault(q, []).append({"start": new_start, "end": None, "type": "change_start"})
@@ -110,9 +135,9 @@ class Parser:
                 continue
             
             # Pattern 3: Extended end "триватиме довше – до 11:00"
-            match = re.search(r'триватиме\s+довше\s*-?\s*(?:до|заживлення.+?о[б]?)\s*(\d{1,2}:\d{2})', entry, re.IGNORECASE)
+            match = self.EXTENDED_END_PATTERN.search(entry)
             if match:
-                new_end = self._normalize_time(match.group(1))
+                new_end = normalize_time(match.group(1))
                 for q in queue_nums:
                     if f"{q}_end" not in processed:
                         queues.setdefault(q, []).append({"start": None, "end": new_end, "type": "change_end"})
@@ -120,9 +145,9 @@ class Parser:
                 continue
             
             # Pattern 4: Extra outage "додатково буде знеструмлено з 16:00 до 18:00"
-            match = re.search(r'додатково.+?з\s*(\d{1,2}:\d{2})\s*до\s*(\d{1,2}:\d{2})', entry, re.IGNORECASE)
+            match = self.EXTRA_PATTERN.search(entry)
             if match:
-                start, end = self._normalize_time(match.group(1)), self._normalize_time(match.group(2))
+                start, end = normalize_time(match.group(1)), normalize_time(match.group(2))
                 for q in queue_nums:
                     queues.setdefault(q, []).append({"start": start, "end": end, "type": "extra"})
     
@@ -142,82 +167,75 @@ class Parser:
             extras = [i for i in intervals if i["type"] == "extra" and i["start"] and i["end"]]
             
             base.sort(key=lambda x: x["start"])
+            starts = [to_minutes(i["start"]) for i in base]
+            ends = [to_minutes(i["end"]) for i in base]
             
             # Apply start/end changes to nearest intervals
             for change in changes:
-                if not base:
-                    continue
                 if change["type"] == "change_start" and change["start"]:
-                    idx = self._find_nearest(base, change["start"], "start")
+                    new_start = to_minutes(change["start"])
+                    idx = self._find_nearest(starts, new_start)
                     if idx is not None:
-                        base[idx]["start"] = change["start"]
+                        starts[idx] = new_start
                 elif change["type"] == "change_end" and change["end"]:
-                    idx = self._find_nearest(base, change["end"], "end")
+                    new_end = to_minutes(change["end"])
+                    idx = self._find_nearest(ends, new_end)
                     if idx is not None:
-                        base[idx]["end"] = change["end"]
-            
-            # Merge full changes with overlapping base intervals
-            for fc in full_changes:
-                merged = False
-                for bi in base:
-                    if self._overlaps(bi, fc):
-                        bi["start"] = min(bi["start"], fc["start"])
-                        bi["end"] = max(bi["end"], fc["end"])
-                        merged = True
-                        break
-                if not merged:
-                    base.append({"start": fc["start"], "end": fc["end"], "type": "base"})
+                        ends[idx] = new_end
             
-            # Add extras
-            base.extend({"start": e["start"], "end": e["end"], "type": "base"} for e in extras)
+            # Full changes and extras join the base; one sort-and-sweep pass
+            # below merges whatever overlaps (no pairwise overlap checks)
+            pairs = list(zip(starts, ends, strict=True))
+            pairs.extend((to_minutes(i["start"]), to_minutes(i["end"])) for i in full_changes)
+            pairs.extend((to_minutes(i["start"]), to_minutes(i["end"])) for i in extras)
             
             # Merge overlapping and sort
-            merged = self._merge_overlapping(base)
+            merged = self._merge_overlapping(pairs)
             if merged:
-                result[queue] = [{"start": i["start"], "end": i["end"], "type": "base"} for i in merged]
+                result[queue] = merged
         
         return result
     
-    def _find_nearest(self, intervals: list, time: str, field: str) -> Optional[int]:
-        """Find index of interval with nearest time value."""
-        if not intervals:
-            return None
+    def _find_nearest(self, values: list[int], time_mins: int) -> Optional[int]:
+        """
+        Find index of the value nearest to time_mins (lowest index on ties).
         
-        time_mins = self._to_minutes(time)
-        best_idx, best_diff = 0, float("inf")
+        A linear scan on purpose: values needn't be sorted (an overnight
+        interval such as 22:00-02:00 ends before the one preceding it),
+        and a queue has only a handful of intervals.
+        """
+        if not values:
+            return None
         
-        for i, interval in enumerate(intervals):
-            diff = abs(self._to_minutes(interval[field]) - time_mins)
+        best_idx, best_diff = 0, abs(values[0] - time_mins)
+        for i in range(1, len(values)):
+            diff = abs(values[i] - time_mins)
             if diff < best_diff:
                 best_idx, best_diff = i, diff
         
         return best_idx
     
-    def _to_minutes(self, time_str: str) -> int:
-        """Convert HH:MM to minutes."""
-        h, m = time_str.split(":")
-        return int(h) * 60 + int(m)
-    
-    def _overlaps(self, i1: dict, i2: dict) -> bool:
-        """Check if two intervals overlap."""
-        s1, e1 = self._to_minutes(i1["start"]), self._to_minutes(i1["end"])
-        s2, e2 = self._to_minutes(i2["start"]), self._to_minutes(i2["end"])
-        return not (e1 <= s2 or e2 <= s1)
-    
-    def _merge_overlapping(self, intervals: list) -> list:
-        """Merge overlapping intervals."""
-        if not intervals:
+    def _merge_overlapping(self, pairs: list[tuple[int, int]]) -> list[dict]:
+        """
+        Merge overlapping (start, end) minute pairs.
+        
+        Works on plain ints and builds interval dicts only for the result.
+        """
+        if not pairs:
             return []
         
-        sorted_ints = sorted(intervals, key=lambda x: self._to_minutes(x["start"]))
-        merged = [sorted_ints[0].copy()]
+        pairs.sort(key=lambda p: p[0])
+        out_starts, out_ends = [pairs[0][0]], [pairs[0][1]]
         
-        for current in sorted_ints[1:]:
-            last = merged[-1]
-            if self._to_minutes(current["start"]) <= self._to_minutes(last["end"]):
-                if self._to_minutes(current["end"]) > self._to_minutes(last["end"]):
-                    last["end"] = current["end"]
+        for start, end in pairs[1:]:
+            if start <= out_ends[-1]:
+                if end > out_ends[-1]:
+                    out_ends[-1] = end
             else:
-                merged.append(current.copy())
+                out_starts.append(start)
+                out_ends.append(end)
         
-        return merged
+        return [
+            {"start": format_minutes(start), "end": format_minutes(end), "type": "base"}
+            for start, end in zip(out_starts, out_ends, strict=True)
+        ]
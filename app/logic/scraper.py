@@ -7,14 +7,25 @@ Uses image alt attributes (e.g., "ГПВ-15.01.26") for reliable date detection.
 
 import logging
 import re
-from typing import Optional
+from enum import Enum
+from typing import Final, Literal, Optional, Union
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 
 logger = logging.getLogger(__name__)
 
 
+class FetchStatus(Enum):
+    """Non-HTML results of Scraper.fetch()."""
+    
+    NOT_MODIFIED = "not_modified"
+
+
+# Returned by Scraper.fetch() when the page is unchanged since the last fetch (HTTP 304)
+NOT_MODIFIED: Final = FetchStatus.NOT_MODIFIED
+
+
 class Scraper:
     """
     Scraper for hoe.com.ua outage schedules page.
@@ -31,31 +42,85 @@ class Scraper:
         HEADERS: HTTP headers for requests
         TIMEOUT: Request timeout in seconds
         DATE_PATTERN: Regex for extracting date from image alt
+        EXTRAS_KEYWORD_PATTERN: Regex for detecting change paragraphs
     """
     
     URL = "https://hoe.com.ua/page/pogodinni-vidkljuchennja"
-    HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        "Accept-Encoding": "gzip, deflate",
+    }
     TIMEOUT = 15
     
     # Regex for date extraction from image alt (e.g., "ГПВ-15.01.26")
     DATE_PATTERN = re.compile(r'ГПВ-(\d{2})\.(\d{2})\.(\d{2,4})')
     
-    def fetch(self) -> Optional[str]:
+    # Keywords marking a paragraph as an operational change (extras)
+    EXTRAS_KEYWORD_PATTERN = re.compile(
+        r'підчерг|відключення|знеструм|раніше|довше|додатково|укренерго',
+        re.IGNORECASE
+    )
+    
+    # Only build the content containers; head, scripts, menus etc. are skipped
+    PAGE_STRAINER = SoupStrainer(["div", "article"])
+    
+    def __init__(self) -> None:
+        """Initialize scraper with a persistent HTTP session (keep-alive)."""
+        self._session = requests.Session()
+        self._session.headers.update(self.HEADERS)
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        # Validators of the last downloaded page, not yet confirmed as processed
+        self._pending_validators: tuple[Optional[str], Optional[str]] = (None, None)
+    
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        self._session.close()
+    
+    def fetch(self) -> Union[str, Literal[FetchStatus.NOT_MODIFIED], None]:
         """
         Fetch HTML content from the website.
         
+        Sends If-None-Match/If-Modified-Since from the last page confirmed
+        with commit_validators(), so an unchanged page costs a 304 instead
+        of a full download.
+        
         Returns:
-            HTML content as string, or None if request failed.
+            HTML content as string, NOT_MODIFIED if the page is unchanged,
+            or None if request failed.
         """
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        
         try:
-            response = requests.get(self.URL, headers=self.HEADERS, timeout=self.TIMEOUT)
+            response = self._session.get(self.URL, headers=headers, timeout=self.TIMEOUT)
+            if response.status_code == 304:
+                logger.info("Page not modified since last fetch")
+                return NOT_MODIFIED
             response.raise_for_status()
+            self._pending_validators = (
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
             logger.info(f"Successfully fetched page ({len(response.text)} bytes)")
             return response.text
         except requests.RequestException as e:
             logger.error(f"Error fetching page: {e}")
             return None
     
+    def commit_validators(self) -> None:
+        """
+        Send the last fetched page's ETag/Last-Modified on future requests.
+        
+        Call only once that page has been parsed and saved: if processing
+        fails, the next fetch downloads the page again instead of getting
+        a 304 for content that was never stored.
+        """
+        self._etag, self._last_modified = self._pending_validators
+    
     def extract_blocks(self, html: str) -> list[dict]:
         """
         Extract schedule blocks from HTML.
@@ -68,74 +133,74 @@ class Scraper:
         Returns:
             List of dicts with keys: date, schedule_text, extras_text
         """
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml", parse_only=self.PAGE_STRAINER)
         content = soup.find("div", class_="post") or soup.find("article")
         
         if not content:
             return []
         
-        elements = content.find_all(["img", "ul", "p", "hr", "h2", "h3"])
+        # Shortlist date images with a CSS filter; run the regex only on those
+        date_search = self.DATE_PATTERN.search
+        date_matches: dict[int, re.Match[str]] = {}
+        for date_img in content.select('img[alt*="ГПВ-"]'):
+            match = date_search(str(date_img["alt"]))
+            if match:
+                date_matches[id(date_img)] = match
+        
+        blocks: list[dict] = []
+        date_str = None       # date of the block being collected
+        in_schedule = False   # between a date image and the next <hr>
+        schedule_parts: list[str] = []
+        extras_parts: list[str] = []  # candidate extras for the next date image
+        block_extras: list[str] = []
+        marker_img: Optional[Tag] = None  # find_all also yields the <img> inside a marker <h2>
         
-        # Find all date-marked images
-        date_markers = []
-        for i, elem in enumerate(elements):
-            img = elem if elem.name == "img" else elem.find("img") if elem.name == "h2" else None
-            if img:
-                match = self.DATE_PATTERN.search(img.get("alt", ""))
+        def flush() -> None:
+            if date_str and schedule_parts:
+                blocks.append({
+                    "date": date_str,
+                    "schedule_text": "".join(schedule_parts),
+                    "extras_text": "\n".join(block_extras)
+                })
+        
+        # Single pass: extras precede a date image, the schedule follows it
+        # up to the next <hr> or date image
+        keyword_search = self.EXTRAS_KEYWORD_PATTERN.search
+        for elem in content.find_all(["img", "ul", "p", "hr", "h2", "h3"]):
+            name = elem.name
+            
+            if name == "img" or name == "h2":
+                img = elem if name == "img" else elem.find("img")
+                if img is None or img is marker_img:
+                    continue
+                match = date_matches.get(id(img))
                 if match:
+                    flush()
+                    marker_img = img
                     day, month, year = match.groups()
                     year = f"20{year}" if len(year) == 2 else year
-                    date_markers.append({"index": i, "date": f"{year}-{month}-{day}"})
-        
-        blocks = []
-        for idx, marker in enumerate(date_markers):
-            img_index = marker["index"]
-            date_str = marker["date"]
-            
-            # Find extras start (after previous hr or beginning)
-            extras_start = 0
-            if idx > 0:
-                prev_index = date_markers[idx - 1]["index"]
-                for j in range(prev_index + 1, img_index):
-                    if elements[j].name == "hr":
-                        extras_start = j + 1
-                        break
-            
-            # Find schedule end (next hr or next date image)
-            schedule_end = len(elements)
-            for j in range(img_index + 1, len(elements)):
-                elem = elements[j]
-                if elem.name == "hr":
-                    schedule_end = j
-                    break
-                img = elem if elem.name == "img" else elem.find("img") if elem.name == "h2" else None
-                if img and self.DATE_PATTERN.search(img.get("alt", "")):
-                    schedule_end = j
-                    break
+                    date_str = f"{year}-{month}-{day}"
+                    in_schedule = True
+                    schedule_parts = []
+                    block_extras = extras_parts
+                    extras_parts = []
             
-            # Collect extras text (before image)
-            extras_text = ""
-            keywords = ["підчерг", "відключення", "знеструм", "раніше", "довше", "додатково", "укренерго"]
-            for j in range(extras_start, img_index):
-                if elements[j].name == "p":
-                    text = elements[j].get_text(strip=True)
-                    if not text.startswith("Електроенергія у підчерг"):
-                        if any(kw in text.lower() for kw in keywords):
-                            extras_text += text + "\n"
+            elif name == "hr":
+                if in_schedule:
+                    in_schedule = False
+                    extras_parts = []
             
-            # Collect schedule text (after image)
-            schedule_text = ""
-            for j in range(img_index + 1, schedule_end):
-                if elements[j].name == "ul":
-                    text = elements[j].get_text(separator="\n", strip=True)
+            elif name == "ul":
+                if in_schedule:
+                    text = elem.get_text(separator="\n", strip=True)
                     if "підчерга" in text.lower():
-                        schedule_text += text + "\n"
+                        schedule_parts.append(text + "\n")
             
-            if schedule_text:
-                blocks.append({
-                    "date": date_str,
-                    "schedule_text": schedule_text,
-                    "extras_text": extras_text.strip()
-                })
+            elif name == "p":
+                text = elem.get_text(strip=True)
+                if not text.startswith("Електроенергія у підчерг"):
+                    if keyword_search(text):
+                        extras_parts.append(text)
         
+        flush()
         return blocks
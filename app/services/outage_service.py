@@ -5,12 +5,13 @@ Orchestrates scraping, parsing, and database operations.
 This is the main entry point for fetching and storing outage data.
 """
 
+import asyncio
 import logging
 from typing import Optional
 
 from app.db.database import Database
 from app.logic.parser import Parser
-from app.logic.scraper import Scraper
+from app.logic.scraper import NOT_MODIFIED, Scraper
 
 logger = logging.getLogger(__name__)
 
@@ -40,18 +41,23 @@ class OutageService:
         self.scraper = Scraper()
         self.parser = Parser()
         self.db = db or Database()
+        self._last_dates: Optional[list[str]] = None
+        self._inflight: Optional[asyncio.Task] = None
     
     def update(self) -> Optional[list[str]]:
         """
         Update database with latest schedules from website.
         
         Fetches the page, extracts schedule blocks, parses them,
-        and saves to database.
+        and saves to database. If the page is unchanged since the last
+        fetch, returns the previous result without parsing.
         
         Returns:
             List of updated dates (YYYY-MM-DD), or None if failed.
         """
         html = self.scraper.fetch()
+        if html is NOT_MODIFIED:
+            return self._last_dates
         if not html:
             logger.warning("Failed to fetch HTML from website")
             return None
@@ -59,19 +65,67 @@ class OutageService:
         blocks = self.scraper.extract_blocks(html)
         if not blocks:
             logger.warning("No schedule blocks found in HTML")
+            self._last_dates = None
             return None
         
+        saved_dates = self._save_blocks(blocks)
+        self._last_dates = saved_dates if saved_dates else None
+        # Only now may an unchanged page be answered from _last_dates
+        self.scraper.commit_validators()
+        return self._last_dates
+    
+    async def update_async(self) -> Optional[list[str]]:
+        """
+        Async variant of update() for use from the event loop.
+        
+        The whole update() runs in a worker thread, so the caller's event
+        loop is never blocked. Concurrent calls share one in-flight update
+        instead of scraping the site again.
+        
+        Returns:
+            List of updated dates (YYYY-MM-DD), or None if failed.
+        """
+        task = self._inflight
+        if task is None:
+            task = self._inflight = asyncio.ensure_future(self._run_update_async())
+            task.add_done_callback(self._clear_inflight)
+        # Shielded: a cancelled caller must not cancel the shared update
+        return await asyncio.shield(task)
+    
+    def _clear_inflight(self, task: asyncio.Task) -> None:
+        """Forget the finished in-flight update."""
+        if self._inflight is task:
+            self._inflight = None
+    
+    async def _run_update_async(self) -> Optional[list[str]]:
+        """Run one update() in a worker thread (see update_async)."""
+        return await asyncio.to_thread(self.update)
+    
+    def _save_blocks(self, blocks: list[dict]) -> list[str]:
+        """
+        Parse all blocks and save them with a single bulk write.
+        
+        Args:
+            blocks: Blocks from Scraper.extract_blocks()
+        
+        Returns:
+            List of saved dates (YYYY-MM-DD).
+        """
         saved_dates = []
+        schedules = {}
+        messages = {}
         for block in blocks:
             parsed = self.parser.parse_block(block)
+            if not parsed["queues"]:
+                continue
             
-            if parsed["queues"]:
-                self.db.save_schedule(
-                    date=parsed["date"],
-                    schedules=parsed["queues"],
-                    message=parsed["message"]
-                )
-                saved_dates.append(parsed["date"])
-                logger.info(f"Saved schedule for {parsed['date']} ({len(parsed['queues'])} queues)")
+            date = parsed["date"]
+            schedules[date] = parsed["queues"]
+            messages[date] = parsed["message"]
+            saved_dates.append(date)
         
-        return saved_dates if saved_dates else None
+        if schedules:
+            self.db.save_bulk(schedules, messages)
+            for date, queues in schedules.items():
+                logger.info(f"Saved schedule for {date} ({len(queues)} queues)")
+        return saved_dates
@@ -9,19 +9,26 @@ Usage:
     uvicorn main:app --reload   # Development with auto-reload
 """
 
+import asyncio
 import logging
+import os
 import re
-from datetime import datetime
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 from zoneinfo import ZoneInfo
 
+import orjson
 import uvicorn
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
+from app.core.models import AllSchedulesResponse, ScheduleResponse, StatusResponse
 from app.db.database import Database
 from app.services.outage_service import OutageService
 
@@ -29,6 +36,9 @@ from app.services.outage_service import OutageService
 
 KYIV_TZ = ZoneInfo("Europe/Kyiv")
 STATIC_DIR = Path(__file__).parent / "app" / "static"
+DB_PATH = os.environ.get("OUTAGES_DB_PATH", "outages.db")
+VALID_QUEUES = frozenset(f"{i}.{j}" for i in range(1, 7) for j in range(1, 3))
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
 
 # --- Logging Configuration ---
 
@@ -41,9 +51,21 @@ logger = logging.getLogger(__name__)
 
 # --- Utility Functions ---
 
+_kyiv_date_cache: tuple[float, str] = (0.0, "")  # (expires at, date)
+
+
 def get_kyiv_date() -> str:
-    """Get current date in Kyiv timezone (YYYY-MM-DD)."""
-    return datetime.now(KYIV_TZ).strftime("%Y-%m-%d")
+    """Get current date in Kyiv timezone (YYYY-MM-DD), cached until Kyiv midnight."""
+    global _kyiv_date_cache
+    expires, today = _kyiv_date_cache
+    if time.time() < expires:
+        return today
+    
+    now = datetime.now(KYIV_TZ)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    today = now.strftime("%Y-%m-%d")
+    _kyiv_date_cache = (midnight.timestamp(), today)
+    return today
 
 
 def validate_queue(queue: str) -> bool:
@@ -56,7 +78,7 @@ def validate_queue(queue: str) -> bool:
     Returns:
         True if queue format is valid.
     """
-    return bool(re.match(r"^[1-6]\.[1-2]$", queue))
+    return queue in VALID_QUEUES
 
 
 def validate_date(date_str: str) -> bool:
@@ -69,47 +91,30 @@ def validate_date(date_str: str) -> bool:
     Returns:
         True if date format is valid.
     """
-    if not re.match(r"^\d{4}-\d{2}-\d{2}$", date_str):
+    if not DATE_PATTERN.fullmatch(date_str):
         return False
     try:
-        datetime.strptime(date_str, "%Y-%m-%d")
+        date.fromisoformat(date_str)
         return True
     except ValueError:
         return False
 
 
-def calculate_hours(intervals: list[dict]) -> float:
-    """
-    Calculate total outage hours from intervals.
-    
-    Args:
-        intervals: List of dicts with start_time/start and end_time/end keys.
-    
-    Returns:
-        Total hours as float (e.g., 5.5 for 5 hours 30 minutes).
-    """
-    total_minutes = 0
-    for interval in intervals:
-        try:
-            start_str = interval.get("start_time") or interval.get("start")
-            end_str = interval.get("end_time") or interval.get("end")
-            start = datetime.strptime(start_str, "%H:%M")
-            end = datetime.strptime(end_str, "%H:%M")
-            
-            # Handle overnight intervals (e.g., 23:00 to 02:00)
-            if end > start:
-                diff_minutes = (end - start).seconds // 60
-            else:
-                diff_minutes = (24 * 60 - start.hour * 60 - start.minute 
-                               + end.hour * 60 + end.minute)
-            total_minutes += diff_minutes
-        except (ValueError, TypeError, AttributeError):
-            continue
+# --- App Configuration ---
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson (default response class of the app)."""
     
-    return round(total_minutes / 60, 1)
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
 
 
-# --- App Configuration ---
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Release the scraper's pooled HTTP connections on shutdown."""
+    yield
+    service.scraper.close()
+
 
 app = FastAPI(
     title="Khmelnytskyi Outage API",
@@ -117,6 +122,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=OrjsonResponse,
+    lifespan=lifespan,
 )
 
 # CORS - allow all origins for frontend/mobile integration
@@ -130,7 +137,7 @@ app.add_middleware(
 
 # --- Dependencies ---
 
-db = Database()
+db = Database(DB_PATH)
 service = OutageService(db)
 
 # Static files for web UI
@@ -138,7 +145,29 @@ STATIC_DIR.mkdir(parents=True, exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 
+async def rendered_response(key: tuple, build: Callable[[], dict]) -> Response:
+    """
+    Serve a pre-serialized JSON body, rendering it on first use.
+    
+    Bodies live in the database read cache, so they are dropped together
+    with the data they were built from on every write. A cached body is
+    served inline; on a miss the query and serialization run in a worker
+    thread, so SQLite never blocks the event loop.
+    
+    Args:
+        key: Cache key identifying the payload (e.g., ("schedule", "3.1", day));
+            build it from validated input only, the cache is bounded
+        build: Builds the payload dict on cache miss
+    """
+    body = db.get_cached(key)
+    if body is None:
+        body = await asyncio.to_thread(db.cached, key, lambda: orjson.dumps(build()))
+    return Response(body, media_type="application/json")
+
+
 # --- API Endpoints ---
+# Read endpoints are async and serve cached bodies without a threadpool
+# hop; only cache misses touch SQLite, in a worker thread.
 
 @app.get("/", response_model=None)
 def root():
@@ -149,8 +178,8 @@ def root():
     return {"name": "Khmelnytskyi Outage API", "version": "1.0.0", "docs": "/docs"}
 
 
-@app.get("/status")
-def health_check() -> dict:
+@app.get("/status", response_model=StatusResponse)
+async def health_check() -> Response:
     """
     Health check endpoint.
     
@@ -158,32 +187,33 @@ def health_check() -> dict:
         System status, last scrape time, and available dates.
         Useful for monitoring data freshness.
     """
-    return {
+    return await rendered_response(("status",), lambda: {
         "status": "healthy",
         "last_scrape": db.get_metadata("last_updated"),
         "available_dates": db.get_dates(),
-        "total_queues": 12,
-    }
+        "total_queues": len(VALID_QUEUES),
+    })
 
 
 @app.get("/update")
-def update_data() -> dict:
+async def update_data() -> dict:
     """
     Fetch and update schedules from hoe.com.ua.
     
-    Scrapes the official website and updates the database.
+    Scrapes the official website and updates the database. Network and
+    parsing run in worker threads, so the event loop stays free.
     
     Returns:
         Status, list of updated dates, and last_updated timestamp.
     """
     try:
-        result = service.update()
+        result = await service.update_async()
         if result:
             return {
                 "status": "success",
                 "dates": result,
                 "message": f"Оновлено графіки для {len(result)} дат",
-                "last_updated": db.get_metadata("last_updated"),
+                "last_updated": await asyncio.to_thread(db.get_metadata, "last_updated"),
             }
         return {"status": "error", "message": "Не вдалося отримати дані з сайту"}
     except Exception:
@@ -191,8 +221,8 @@ def update_data() -> dict:
         return {"status": "error", "message": "Внутрішня помилка сервера"}
 
 
-@app.get("/schedule/{queue}")
-def get_schedule(queue: str, day: Optional[str] = None) -> dict:
+@app.get("/schedule/{queue}", response_model=ScheduleResponse)
+async def get_schedule(queue: str, day: Optional[str] = None) -> Response:
     """
     Get outage schedule for a specific queue.
     
@@ -217,45 +247,27 @@ def get_schedule(queue: str, day: Optional[str] = None) -> dict:
     
     if not validate_queue(queue):
         raise HTTPException(status_code=400, detail="Невірний формат черги. Використовуйте: 1.1 - 6.2")
+    if not validate_date(target):
+        raise HTTPException(status_code=400, detail="Невірний формат дати. Використовуйте: YYYY-MM-DD")
     
-    data = db.get_schedule(queue, target)
-    intervals = [{"start": i["start_time"], "end": i["end_time"], "type": i["type"]} for i in data]
-    
-    return {
-        "queue": queue,
-        "date": target,
-        "status": "active" if data else "no_data",
-        "intervals": intervals,
-        "operational_message": db.get_message(target),
-        "last_updated": db.get_metadata("last_updated"),
-        "total_hours_off": calculate_hours(data)
-    }
+    return await rendered_response(
+        ("schedule", queue, target), lambda: db.get_schedule_bundle(queue, target)
+    )
 
 
-@app.get("/schedule/{queue}/{day}")
-def get_schedule_by_date(queue: str, day: str):
+@app.get("/schedule/{queue}/{day}", response_model=ScheduleResponse)
+async def get_schedule_by_date(queue: str, day: str) -> Response:
     """Get outage schedule for a queue on a specific date."""
     if not validate_queue(queue):
         raise HTTPException(status_code=400, detail="Невірний формат черги")
     if not validate_date(day):
         raise HTTPException(status_code=400, detail="Невірний формат дати. Використовуйте: YYYY-MM-DD")
     
-    data = db.get_schedule(queue, day)
-    intervals = [{"start": i["start_time"], "end": i["end_time"], "type": i["type"]} for i in data]
-    
-    return {
-        "queue": queue,
-        "date": day,
-        "status": "active" if data else "no_data",
-        "intervals": intervals,
-        "operational_message": db.get_message(day),
-        "last_updated": db.get_metadata("last_updated"),
-        "total_hours_off": calculate_hours(data)
-    }
+    return await rendered_response(("schedule", queue, day), lambda: db.get_schedule_bundle(queue, day))
 
 
-@app.get("/all/{day}")
-def get_all_schedules(day: str = None):
+@app.get("/all/{day}", response_model=AllSchedulesResponse)
+async def get_all_schedules(day: str = None) -> Response:
     """
     Get schedules for all queues on a specific date.
     
@@ -264,28 +276,16 @@ def get_all_schedules(day: str = None):
     """
     target = day or get_kyiv_date()
     
-    all_schedules = db.get_all_schedules(target)
-    queues = {}
-    
-    for queue_name, intervals in all_schedules.items():
-        normalized = [{"start": i["start_time"], "end": i["end_time"], "type": i["type"]} for i in intervals]
-        queues[queue_name] = {
-            "intervals": normalized,
-            "total_hours_off": calculate_hours(intervals)
-        }
+    if not validate_date(target):
+        raise HTTPException(status_code=400, detail="Невірний формат дати. Використовуйте: YYYY-MM-DD")
     
-    return {
-        "date": target,
-        "last_updated": db.get_metadata("last_updated"),
-        "operational_message": db.get_message(target),
-        "queues": queues
-    }
+    return await rendered_response(("all", target), lambda: db.get_day_bundle(target))
 
 
 @app.get("/dates")
-def get_dates() -> dict:
+async def get_dates() -> Response:
     """Get list of available dates in the database."""
-    return {"dates": db.get_dates()}
+    return await rendered_response(("dates",), lambda: {"dates": db.get_dates()})
 
 
 # --- Entry Point ---
@@ -2,9 +2,84 @@
 Pytest configuration and shared fixtures.
 """
 
-import pytest
-import sys
 import os
+from typing import Optional
+
+import pytest
+
+# Keep the app (main.db) off ./outages.db: each test process gets its own
+# in-memory database. Must be set before main is first imported.
+os.environ["OUTAGES_DB_PATH"] = ":memory:"
+
+# Sample data loaded into the test database: {date: (schedules, message)}
+SAMPLE_DATA = {
+    "2026-01-15": (
+        {
+            "1.1": [{"start": "04:00", "end": "09:00", "type": "base"}],
+            "1.2": [{"start": "10:00", "end": "15:00", "type": "base"}],
+            "2.1": [
+                {"start": "06:00", "end": "11:00", "type": "base"},
+                {"start": "18:00", "end": "23:00", "type": "base"}
+            ],
+            "3.1": [{"start": "08:00", "end": "13:00", "type": "base"}],
+        },
+        "Тестове оперативне повідомлення про зміни в графіку.",
+    ),
+    "2026-01-16": (
+        {
+            "1.1": [{"start": "05:00", "end": "10:00", "type": "base"}],
+            "2.1": [{"start": "07:00", "end": "12:00", "type": "base"}],
+        },
+        None,
+    ),
+}
+
+
+# last_updated written by the most recent load_sample_data() into the test database
+_sample_loaded_at: Optional[str] = None
+
+
+def load_sample_data(database) -> str:
+    """Replace all database content with SAMPLE_DATA; return last_updated."""
+    with database.transaction() as conn:
+        for table in ("schedules", "schedule_totals", "daily_messages", "metadata"):
+            conn.execute(f"DELETE FROM {table}")
+        for date, (schedules, message) in SAMPLE_DATA.items():
+            database.save_schedule(date=date, schedules=schedules, message=message)
+    return database.get_metadata("last_updated")
+
+
+@pytest.fixture(scope="session")
+def test_db():
+    """The app's in-memory database with sample data (loaded once per session)."""
+    from main import db
+    
+    global _sample_loaded_at
+    _sample_loaded_at = load_sample_data(db)
+    
+    yield db
+    
+    db.close()
+
+
+@pytest.fixture(autouse=True)
+def reset_test_db(request):
+    """Restore sample data after a test that wrote to the shared test database."""
+    global _sample_loaded_at
+    yield
+    # Only tests that use the database (directly or through client) can have changed it
+    if "test_db" not in request.fixturenames:
+        return
+    test_database = request.getfixturevalue("test_db")
+    if test_database.get_metadata("last_updated") != _sample_loaded_at:
+        _sample_loaded_at = load_sample_data(test_database)
+
 
-# Add project root to Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+@pytest.fixture(scope="session")
+def client(test_db):
+    """Create one test client (with app lifespan) shared by all tests."""
+    from fastapi.testclient import TestClient
+    from main import app
+    
+    with TestClient(app) as test_client:
+        yield test_client
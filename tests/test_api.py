@@ -5,66 +5,24 @@ Tests API endpoints with mocked data, independent of external website.
 Run with: pytest tests/ -v
 """
 
+import asyncio
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+from starlette.middleware.cors import CORSMiddleware
 from unittest.mock import patch, MagicMock
-import tempfile
-import os
 
 # Import app after setting up test database
-from main import app, db, service
-
+from main import KYIV_TZ, app, db, get_kyiv_date, rendered_response, service, validate_queue
 
-@pytest.fixture
-def client():
-    """Create test client."""
-    return TestClient(app)
 
-
-@pytest.fixture
-def test_db():
-    """Create temporary test database with sample data."""
-    from app.db.database import Database
-    
-    # Use temporary file for test database
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        test_db_path = f.name
-    
-    test_database = Database(db_path=test_db_path)
-    
-    # Insert sample data
-    sample_schedules = {
-        "1.1": [{"start": "04:00", "end": "09:00", "type": "base"}],
-        "1.2": [{"start": "10:00", "end": "15:00", "type": "base"}],
-        "2.1": [
-            {"start": "06:00", "end": "11:00", "type": "base"},
-            {"start": "18:00", "end": "23:00", "type": "base"}
-        ],
-        "3.1": [{"start": "08:00", "end": "13:00", "type": "base"}],
-    }
-    
-    test_database.save_schedule(
-        date="2026-01-15",
-        schedules=sample_schedules,
-        message="Тестове оперативне повідомлення про зміни в графіку."
-    )
-    
-    test_database.save_schedule(
-        date="2026-01-16",
-        schedules={
-            "1.1": [{"start": "05:00", "end": "10:00", "type": "base"}],
-            "2.1": [{"start": "07:00", "end": "12:00", "type": "base"}],
-        },
-        message=None
-    )
-    
-    yield test_database
-    
-    # Cleanup - just try to remove the file
-    try:
-        os.unlink(test_db_path)
-    except (PermissionError, OSError):
-        pass  # Windows may still lock the file
+@pytest.fixture(scope="session")
+def warm_openapi(client):
+    """Build the OpenAPI schema once; FastAPI caches it on app.openapi_schema."""
+    client.get("/openapi.json").raise_for_status()
 
 
 class TestHealthCheck:
@@ -81,13 +39,11 @@ class TestHealthCheck:
         assert "available_dates" in data
         assert data["total_queues"] == 12
     
-    def test_status_lists_available_dates(self, client, test_db):
+    def test_status_lists_available_dates(self, client):
         """Status should list dates from database."""
-        # Patch the global db with test_db
-        with patch.object(service, 'db', test_db):
-            # Re-import to get fresh db reference
-            response = client.get("/status")
-            assert response.status_code == 200
+        response = client.get("/status")
+        assert response.status_code == 200
+        assert "2026-01-15" in response.json()["available_dates"]
 
 
 class TestScheduleEndpoints:
@@ -107,32 +63,41 @@ class TestScheduleEndpoints:
         assert "operational_message" in data
         assert "last_updated" in data
     
-    def test_get_schedule_invalid_queue_format(self, client):
-        """Should return 400 for invalid queue format."""
-        invalid_queues = ["7.1", "1.3", "0.1", "abc", "11", "1.1.1"]
+    def test_get_schedule_invalid_queue_format(self):
+        """Should return 400 for invalid queue format (requests gathered on one event loop)."""
+        queues = ["7.1", "1.3", "0.1", "abc", "11", "1.1.1"]
         
-        for queue in invalid_queues:
-            response = client.get(f"/schedule/{queue}/2026-01-15")
-            assert response.status_code == 400, f"Expected 400 for queue: {queue}"
-    
-    def test_get_schedule_valid_queues(self, client):
-        """Should accept all valid queue formats (1.1 - 6.2)."""
-        valid_queues = [f"{i}.{j}" for i in range(1, 7) for j in range(1, 3)]
+        async def fetch_all():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as aclient:
+                return await asyncio.gather(
+                    *(aclient.get(f"/schedule/{queue}/2026-01-15") for queue in queues)
+                )
         
-        for queue in valid_queues:
-            response = client.get(f"/schedule/{queue}/2026-01-15")
-            assert response.status_code == 200, f"Expected 200 for queue: {queue}"
-            assert response.json()["queue"] == queue
+        responses = asyncio.run(fetch_all())
+        
+        assert {q: r.status_code for q, r in zip(queues, responses, strict=True)} == dict.fromkeys(queues, 400)
+    
+    @pytest.mark.parametrize("queue", [f"{i}.{j}" for i in range(1, 7) for j in range(1, 3)])
+    def test_validate_queue_accepts_valid_queues(self, queue):
+        """Should accept all valid queue formats (1.1 - 6.2) without an HTTP round trip."""
+        assert validate_queue(queue)
     
-    def test_get_schedule_invalid_date_format(self, client):
+    # Note: dates with "/" are interpreted as path segments by FastAPI (404)
+    # Only test formats that reach the validation logic
+    @pytest.mark.parametrize("date", ["15-01-2026", "15.01.2026", "invalid", "2026-1-15", "2026-01-5"])
+    def test_get_schedule_invalid_date_format(self, client, date):
         """Should return 400 for invalid date format."""
-        # Note: dates with "/" are interpreted as path segments by FastAPI (404)
-        # Only test formats that reach the validation logic
-        invalid_dates = ["15-01-2026", "15.01.2026", "invalid", "2026-1-15", "2026-01-5"]
-        
-        for date in invalid_dates:
-            response = client.get(f"/schedule/1.1/{date}")
-            assert response.status_code == 400, f"Expected 400 for date: {date}"
+        response = client.get(f"/schedule/1.1/{date}")
+        assert response.status_code == 400, f"Expected 400 for date: {date}"
+    
+    @pytest.mark.parametrize("date", ["invalid", "2026-02-30", "x" * 1000])
+    def test_get_schedule_invalid_day_query(self, client, date):
+        """Should return 400 for an invalid ?day= before touching the cache."""
+        cache_size = len(db._cache)
+        response = client.get("/schedule/1.1", params={"day": date})
+        assert response.status_code == 400
+        assert len(db._cache) == cache_size
     
     def test_get_schedule_no_data_status(self, client):
         """Should return no_data status for dates without data."""
@@ -144,15 +109,74 @@ class TestScheduleEndpoints:
         assert data["intervals"] == []
         assert data["total_hours_off"] == 0.0
     
-    def test_get_schedule_default_date(self, client):
-        """Should use today's date when date not provided."""
+    def test_get_schedule_rendered_body_refreshed_on_save(self, client, test_db):
+        """Pre-rendered schedule bodies should be rebuilt after a write."""
+        before = client.get("/schedule/6.2/2026-01-15").json()
+        test_db.save_schedule(
+            date="2026-01-15",
+            schedules={"6.2": [{"start": "01:00", "end": "03:00", "type": "base"}]},
+        )
+        after = client.get("/schedule/6.2/2026-01-15").json()
+        
+        assert before["status"] == "no_data"
+        assert after["status"] == "active"
+        assert after["total_hours_off"] == 2.0
+    
+    def test_rendered_response_builds_off_event_loop(self, test_db):
+        """Cache misses should be built in a worker thread; hits are served without rebuilding."""
+        build_threads = []
+        
+        def build():
+            build_threads.append(threading.get_ident())
+            return {"ok": True}
+        
+        async def render_twice():
+            first = await rendered_response(("test",), build)
+            second = await rendered_response(("test",), build)
+            return threading.get_ident(), first.body, second.body
+        
+        loop_thread, first, second = asyncio.run(render_twice())
+        
+        assert first == second == b'{"ok":true}'
+        assert len(build_threads) == 1
+        assert build_threads[0] != loop_thread
+    
+    def test_get_schedule_default_date(self, client, monkeypatch):
+        """Should use today's Kyiv date when date not provided."""
+        monkeypatch.setattr("main.get_kyiv_date", lambda: "2026-01-15")
         response = client.get("/schedule/1.1")
         
         assert response.status_code == 200
         data = response.json()
-        # Date should be set (either today or Kyiv timezone today)
-        assert "date" in data
-        assert len(data["date"]) == 10  # YYYY-MM-DD format
+        assert data["date"] == "2026-01-15"
+
+
+class TestKyivDate:
+    """Tests for the cached Kyiv date."""
+    
+    def test_date_rolls_over_at_kyiv_midnight(self, monkeypatch):
+        """Cached date should be reused until Kyiv midnight, then recomputed."""
+        clock = [datetime(2026, 1, 15, 23, 59, 30, tzinfo=KYIV_TZ)]
+        now_calls = []
+        
+        class FakeDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                now_calls.append(tz)
+                return clock[0].astimezone(tz)
+        
+        monkeypatch.setattr("main.datetime", FakeDatetime)
+        monkeypatch.setattr("main.time", SimpleNamespace(time=lambda: clock[0].timestamp()))
+        monkeypatch.setattr("main._kyiv_date_cache", (0.0, ""))
+        
+        assert get_kyiv_date() == "2026-01-15"
+        clock[0] = datetime(2026, 1, 15, 23, 59, 59, tzinfo=KYIV_TZ)
+        assert get_kyiv_date() == "2026-01-15"
+        assert len(now_calls) == 1  # served from cache
+        
+        clock[0] = datetime(2026, 1, 16, 0, 0, 1, tzinfo=KYIV_TZ)
+        assert get_kyiv_date() == "2026-01-16"
+        assert len(now_calls) == 2
 
 
 class TestAllSchedulesEndpoint:
@@ -187,6 +211,14 @@ class TestAllSchedulesEndpoint:
         assert response.status_code == 200
         data = response.json()
         assert data["queues"] == {}
+    
+    @pytest.mark.parametrize("date", ["invalid", "2026-13-01", "x" * 1000])
+    def test_get_all_schedules_invalid_date(self, client, date):
+        """Should return 400 for an invalid date before touching the cache."""
+        cache_size = len(db._cache)
+        response = client.get(f"/all/{date}")
+        assert response.status_code == 400
+        assert len(db._cache) == cache_size
 
 
 class TestDatesEndpoint:
@@ -214,7 +246,7 @@ class TestDatesEndpoint:
 class TestUpdateEndpoint:
     """Tests for /update endpoint."""
     
-    def test_update_success(self, client):
+    def test_update_success(self, client, monkeypatch):
         """Should return success when scraping works."""
         # Mock the scraper to return test HTML
         mock_html = """
@@ -226,30 +258,100 @@ class TestUpdateEndpoint:
         </div>
         """
         
-        with patch.object(service.scraper, 'fetch', return_value=mock_html):
-            with patch.object(service.scraper, 'extract_blocks', return_value=[
+        def extract_blocks(html):
+            return [
                 {
                     "date": "2026-01-20",
                     "schedule_text": "підчерга 1.1 – з 10:00 до 15:00",
                     "extras_text": ""
                 }
-            ]):
-                response = client.get("/update")
+            ]
         
-                assert response.status_code == 200
-                data = response.json()
-                assert data["status"] == "success"
-                assert "dates" in data
-                assert "message" in data
+        monkeypatch.setattr(service.scraper, "fetch", lambda: mock_html)
+        monkeypatch.setattr(service.scraper, "extract_blocks", extract_blocks)
+        response = client.get("/update")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert "dates" in data
+        assert "message" in data
     
-    def test_update_failure(self, client):
+    def test_update_failure(self, client, monkeypatch):
         """Should return error when scraping fails."""
-        with patch.object(service.scraper, 'fetch', return_value=None):
-            response = client.get("/update")
+        monkeypatch.setattr(service.scraper, "fetch", lambda: None)
+        response = client.get("/update")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "error"
+    
+    def test_update_not_modified_skips_parsing(self, monkeypatch):
+        """HTTP 304 should return the previous result without parsing."""
+        response = MagicMock(status_code=304)
+        monkeypatch.setattr(service, "_last_dates", ["2026-01-20"])
+        monkeypatch.setattr(service.scraper, "_etag", '"abc"')
+        
+        with patch.object(service.scraper._session, 'get', return_value=response) as get, \
+                patch.object(service.scraper, 'extract_blocks') as extract:
+            assert service.update() == ["2026-01-20"]
+        
+        assert get.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
+        extract.assert_not_called()
+    
+    def test_update_failure_keeps_page_refetchable(self, test_db, monkeypatch):
+        """A page whose save failed must be downloaded again, not answered with 304."""
+        blocks = [{"date": "2026-01-20", "schedule_text": "підчерга 1.1 – з 10:00 до 15:00", "extras_text": ""}]
+        response = MagicMock(status_code=200, text="<html></html>", headers={"ETag": '"new"'})
+        
+        monkeypatch.setattr(service, "_last_dates", ["2026-01-15"])
+        monkeypatch.setattr(service.scraper, "_etag", '"old"')
+        monkeypatch.setattr(service.scraper, "_last_modified", None)
+        monkeypatch.setattr(service.scraper, "_pending_validators", (None, None))
+        monkeypatch.setattr(service.scraper, "extract_blocks", lambda html: blocks)
+        
+        with patch.object(service.scraper._session, 'get', return_value=response) as get:
+            with patch.object(test_db, 'save_bulk', side_effect=RuntimeError("disk full")):
+                with pytest.raises(RuntimeError):
+                    service.update()
             
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "error"
+            assert service.update() == ["2026-01-20"]
+        
+        assert get.call_args.kwargs["headers"]["If-None-Match"] == '"old"'
+        assert service.scraper._etag == '"new"'
+        assert test_db.get_schedule("1.1", "2026-01-20") != []
+    
+    def test_update_async_coalesces_concurrent_calls(self, test_db, monkeypatch):
+        """Concurrent async updates should share a single scrape."""
+        blocks = [{"date": "2026-01-20", "schedule_text": "підчерга 1.1 – з 10:00 до 15:00", "extras_text": ""}]
+        
+        async def update_twice():
+            return await asyncio.gather(service.update_async(), service.update_async())
+        
+        monkeypatch.setattr(service.scraper, "extract_blocks", lambda html: blocks)
+        
+        with patch.object(service.scraper, 'fetch', return_value="<html></html>") as fetch:
+            first, second = asyncio.run(update_twice())
+        
+        assert first == second == ["2026-01-20"]
+        fetch.assert_called_once()
+    
+    def test_update_async_saves_blocks(self, test_db, monkeypatch):
+        """Async update should parse and save every block off the event loop."""
+        blocks = [
+            {"date": "2026-01-20", "schedule_text": "підчерга 1.1 – з 10:00 до 15:00", "extras_text": ""},
+            {"date": "2026-01-21", "schedule_text": "підчерга 2.1 – з 06:00 до 11:00", "extras_text": ""},
+        ]
+        
+        monkeypatch.setattr(service.scraper, "fetch", lambda: "<html></html>")
+        monkeypatch.setattr(service.scraper, "extract_blocks", lambda html: blocks)
+        
+        dates = asyncio.run(service.update_async())
+        
+        assert dates == ["2026-01-20", "2026-01-21"]
+        assert test_db.get_schedule("2.1", "2026-01-21") == [
+            {"start_time": "06:00", "end_time": "11:00", "type": "base"}
+        ]
 
 
 class TestResponseFormat:
@@ -292,30 +394,26 @@ class TestResponseFormat:
 class TestTotalHoursCalculation:
     """Tests for total_hours_off calculation."""
     
-    def test_hours_calculation_simple(self, client, test_db):
+    def test_hours_calculation_simple(self, test_db):
         """Should correctly calculate hours for single interval."""
         # 04:00 - 09:00 = 5 hours
-        with patch('main.db', test_db):
-            data = test_db.get_schedule("1.1", "2026-01-15")
-            
-            # Manual calculation
-            from main import calculate_hours
-            hours = calculate_hours(data)
-            assert hours == 5.0
+        assert test_db.get_schedule_bundle("1.1", "2026-01-15")["total_hours_off"] == 5.0
     
-    def test_hours_calculation_multiple_intervals(self, client, test_db):
+    def test_hours_calculation_multiple_intervals(self, test_db):
         """Should sum hours for multiple intervals."""
         # 2.1: 06:00-11:00 (5h) + 18:00-23:00 (5h) = 10h
-        from main import calculate_hours
+        assert test_db.get_schedule_bundle("2.1", "2026-01-15")["total_hours_off"] == 10.0
+    
+    def test_hours_calculation_overnight(self, test_db):
+        """Overnight intervals should count the hours past midnight."""
+        test_db.save_schedule("2026-01-18", {"3.1": [{"start": "23:00", "end": "02:00", "type": "base"}]})
         
-        data = test_db.get_schedule("2.1", "2026-01-15")
-        hours = calculate_hours(data)
-        assert hours == 10.0
+        assert test_db.get_schedule_bundle("3.1", "2026-01-18")["total_hours_off"] == 3.0
+        assert test_db.get_day_bundle("2026-01-18")["queues"]["3.1"]["total_hours_off"] == 3.0
     
-    def test_hours_calculation_empty(self, client):
-        """Should return 0 for empty intervals."""
-        from main import calculate_hours
-        assert calculate_hours([]) == 0.0
+    def test_hours_calculation_empty(self, test_db):
+        """Should return 0 for a queue without intervals."""
+        assert test_db.get_schedule_bundle("6.2", "2026-01-15")["total_hours_off"] == 0.0
 
 
 class TestEdgeCases:
@@ -326,17 +424,10 @@ class TestEdgeCases:
         response = client.get("/schedule/1.1/2026-01-15")
         assert response.status_code == 200
     
-    def test_future_dates(self, client):
-        """Should handle future dates."""
-        response = client.get("/schedule/1.1/2030-12-31")
-        assert response.status_code == 200
-        assert response.json()["status"] == "no_data"
-    
-    def test_past_dates(self, client):
-        """Should handle past dates."""
-        response = client.get("/schedule/1.1/2020-01-01")
-        assert response.status_code == 200
-        assert response.json()["status"] == "no_data"
+    @pytest.mark.parametrize("date", ["2030-12-31", "2020-01-01"])
+    def test_dates_without_data(self, test_db, date):
+        """Should find no intervals for future and past dates."""
+        assert test_db.get_schedule("1.1", date) == []
     
     def test_special_characters_in_date(self, client):
         """Should reject dates with special characters."""
@@ -347,33 +438,30 @@ class TestEdgeCases:
 class TestCORS:
     """Tests for CORS configuration."""
     
-    def test_cors_headers(self, client):
-        """Should include CORS headers in response."""
-        response = client.options(
-            "/schedule/1.1",
-            headers={"Origin": "http://example.com"}
-        )
-        # FastAPI handles CORS, check that it doesn't block
-        assert response.status_code in (200, 405)
+    def test_cors_middleware_configured(self):
+        """CORS middleware should be registered and allow all origins."""
+        cors = [m for m in app.user_middleware if m.cls is CORSMiddleware]
+        
+        assert len(cors) == 1
+        assert cors[0].kwargs["allow_origins"] == ["*"]
 
 
+@pytest.mark.usefixtures("warm_openapi")
 class TestDocumentation:
     """Tests for API documentation endpoints."""
     
-    def test_openapi_available(self, client):
-        """OpenAPI schema should be available."""
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-        data = response.json()
-        assert "openapi" in data
-        assert "paths" in data
+    def test_openapi_available(self):
+        """OpenAPI schema should be available (built by the warm_openapi fixture)."""
+        assert app.openapi_schema is not None
+        assert "openapi" in app.openapi_schema
+        assert "paths" in app.openapi_schema
     
     def test_docs_available(self, client):
         """Swagger UI should be available."""
-        response = client.get("/docs")
+        response = client.head("/docs")
         assert response.status_code == 200
     
     def test_redoc_available(self, client):
         """ReDoc should be available."""
-        response = client.get("/redoc")
+        response = client.head("/redoc")
         assert response.status_code == 200
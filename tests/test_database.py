@@ -0,0 +1,239 @@
+"""
+Unit tests for the SQLite database layer.
+
+Run with: pytest tests/test_database.py -v
+"""
+
+import sqlite3
+
+import pytest
+
+from app.db.database import Database
+
+# Schema written by versions that stored times as "HH:MM" text (user_version 0)
+LEGACY_SCHEMA_SQL = """
+    CREATE TABLE queues (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL
+    );
+    CREATE TABLE schedules (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        queue_id INTEGER NOT NULL,
+        day_date TEXT NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        type TEXT DEFAULT 'base',
+        FOREIGN KEY (queue_id) REFERENCES queues(id)
+    );
+    CREATE TABLE daily_messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        day_date TEXT UNIQUE NOT NULL,
+        message TEXT NOT NULL
+    );
+    CREATE TABLE metadata (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    CREATE INDEX idx_schedules_date ON schedules(day_date);
+    CREATE INDEX idx_schedules_queue_date ON schedules(queue_id, day_date);
+"""
+
+# Added in user_version 1 (times still text)
+LEGACY_TOTALS_SQL = """
+    CREATE TABLE schedule_totals (
+        queue_id INTEGER NOT NULL,
+        day_date TEXT NOT NULL,
+        total_minutes INTEGER NOT NULL,
+        PRIMARY KEY (queue_id, day_date),
+        FOREIGN KEY (queue_id) REFERENCES queues(id)
+    );
+"""
+
+LEGACY_ROWS = [
+    # (queue, date, start, end)
+    ("1.1", "2026-01-15", "04:00", "09:00"),
+    ("1.1", "2026-01-15", "22:30", "24:00"),
+    ("2.1", "2026-01-15", "23:00", "02:00"),  # overnight
+    ("2.1", "2026-01-16", "06:00", "11:30"),
+]
+
+
+def create_legacy_db(path, version):
+    """Write a database as an older release left it at the given user_version."""
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA_SQL)
+    conn.executemany(
+        "INSERT INTO queues (name) VALUES (?)",
+        [(f"{i}.{j}",) for i in range(1, 7) for j in range(1, 3)]
+    )
+    queue_ids = dict(conn.execute("SELECT name, id FROM queues"))
+    conn.executemany(
+        "INSERT INTO schedules (queue_id, day_date, start_time, end_time) VALUES (?, ?, ?, ?)",
+        [(queue_ids[queue], date, start, end) for queue, date, start, end in LEGACY_ROWS]
+    )
+    if version >= 1:
+        conn.executescript(LEGACY_TOTALS_SQL)
+        conn.executemany(
+            "INSERT INTO schedule_totals VALUES (?, ?, ?)",
+            [(queue_ids["1.1"], "2026-01-15", 390),
+             (queue_ids["2.1"], "2026-01-15", 180),
+             (queue_ids["2.1"], "2026-01-16", 330)]
+        )
+    conn.execute(f"PRAGMA user_version = {version}")
+    conn.commit()
+    conn.close()
+
+
+class TestDatabase:
+    """Tests for reads, writes and the read cache."""
+    
+    def test_dates_cache_invalidated_on_save(self, test_db):
+        """Cached dates should refresh after a new schedule is saved."""
+        assert "2026-01-17" not in test_db.get_dates()
+        
+        test_db.save_schedule(
+            date="2026-01-17",
+            schedules={"1.1": [{"start": "01:00", "end": "02:00", "type": "base"}]},
+        )
+        
+        assert test_db.get_dates()[0] == "2026-01-17"
+    
+    def test_read_cache_is_bounded(self, test_db, monkeypatch):
+        """Cached reads should evict old keys once the cache is full."""
+        test_db._invalidate_cache()
+        monkeypatch.setattr(test_db, "CACHE_MAX_ENTRIES", 3)
+        
+        for queue in ["1.1", "1.2", "2.1", "3.1"]:
+            test_db.get_schedule(queue, "2026-01-15")
+        
+        assert len(test_db._cache) == 3
+        assert ("schedule", "1.1", "2026-01-15") not in test_db._cache
+    
+    def test_save_bulk_replaces_each_date(self, test_db):
+        """Bulk save should replace schedules and messages for every given date."""
+        test_db.save_bulk(
+            {
+                "2026-01-15": {"1.1": [{"start": "01:00", "end": "02:00", "type": "base"}]},
+                "2026-01-17": {"2.1": [{"start": "03:00", "end": "05:00", "type": "base"}]},
+            },
+            {"2026-01-15": None, "2026-01-17": "Нове повідомлення"},
+        )
+        
+        assert test_db.get_all_schedules("2026-01-15") == {
+            "1.1": [{"start_time": "01:00", "end_time": "02:00", "type": "base"}]
+        }
+        assert test_db.get_message("2026-01-15") is None
+        assert test_db.get_message("2026-01-17") == "Нове повідомлення"
+        assert test_db.get_schedule_bundle("2.1", "2026-01-17")["total_hours_off"] == 2.0
+        assert test_db.get_schedule("1.1", "2026-01-16")  # other dates untouched
+    
+    def test_transaction_rolls_back_grouped_saves(self, test_db):
+        """A failure inside transaction() should discard every save in it."""
+        schedules = {"1.1": [{"start": "01:00", "end": "02:00", "type": "base"}]}
+        
+        with pytest.raises(RuntimeError):
+            with test_db.transaction():
+                test_db.save_schedule(date="2026-01-17", schedules=schedules)
+                test_db.save_schedule(date="2026-01-18", schedules=schedules)
+                raise RuntimeError("boom")
+        
+        assert "2026-01-17" not in test_db.get_dates()
+        assert "2026-01-18" not in test_db.get_dates()
+    
+    def test_day_bundle(self, test_db):
+        """Day bundle should combine schedules, totals and message."""
+        bundle = test_db.get_day_bundle("2026-01-15")
+        
+        assert bundle["operational_message"].startswith("Тестове")
+        assert bundle["last_updated"] is not None
+        assert bundle["queues"]["2.1"] == {
+            "intervals": [
+                {"start": "06:00", "end": "11:00", "type": "base"},
+                {"start": "18:00", "end": "23:00", "type": "base"},
+            ],
+            "total_hours_off": 10.0,
+        }
+        
+        empty = test_db.get_day_bundle("2020-01-01")
+        assert empty["queues"] == {}
+        assert empty["last_updated"] == bundle["last_updated"]
+    
+    def test_schedule_bundle(self, test_db):
+        """Schedule bundle should match the separate per-field lookups."""
+        bundle = test_db.get_schedule_bundle("2.1", "2026-01-15")
+        
+        assert bundle["status"] == "active"
+        assert bundle["intervals"] == [
+            {"start": i["start_time"], "end": i["end_time"], "type": i["type"]}
+            for i in test_db.get_schedule("2.1", "2026-01-15")
+        ]
+        assert bundle["total_hours_off"] == 10.0
+        assert bundle["operational_message"] == test_db.get_message("2026-01-15")
+        assert bundle["last_updated"] == test_db.get_metadata("last_updated")
+        
+        empty = test_db.get_schedule_bundle("6.2", "2026-01-15")
+        assert empty["status"] == "no_data"
+        assert empty["intervals"] == []
+        assert empty["total_hours_off"] == 0.0
+
+
+class TestMigration:
+    """Tests for upgrading databases written by older versions."""
+    
+    @pytest.mark.parametrize("version", [0, 1])
+    def test_text_times_migrated(self, tmp_path, version):
+        """Text times become minutes, totals are present and user_version is current."""
+        path = str(tmp_path / "outages.db")
+        create_legacy_db(path, version)
+        
+        database = Database(db_path=path, pool_size=1)
+        try:
+            with database._acquire() as conn:
+                columns = {row["name"]: row["type"] for row in conn.execute("PRAGMA table_info(schedules)")}
+                rows = conn.execute(
+                    """SELECT queues.name, day_date, start_time, end_time FROM schedules
+                       JOIN queues ON queues.id = schedules.queue_id ORDER BY schedules.id"""
+                ).fetchall()
+                totals = conn.execute(
+                    """SELECT queues.name, day_date, total_minutes FROM schedule_totals
+                       JOIN queues ON queues.id = schedule_totals.queue_id ORDER BY queues.name, day_date"""
+                ).fetchall()
+                tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+                user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            
+            assert columns["start_time"] == columns["end_time"] == "INTEGER"
+            assert [tuple(row) for row in rows] == [
+                ("1.1", "2026-01-15", 240, 540),
+                ("1.1", "2026-01-15", 1350, 1440),
+                ("2.1", "2026-01-15", 1380, 120),
+                ("2.1", "2026-01-16", 360, 690),
+            ]
+            assert "schedules_text" not in tables
+            assert user_version == Database.SCHEMA_VERSION == 2
+            
+            assert [tuple(row) for row in totals] == [
+                ("1.1", "2026-01-15", 390),
+                ("2.1", "2026-01-15", 180),
+                ("2.1", "2026-01-16", 330),
+            ]
+            assert database.get_schedule("2.1", "2026-01-15") == [
+                {"start_time": "23:00", "end_time": "02:00", "type": "base"}
+            ]
+        finally:
+            database.close()
+    
+    def test_current_database_reopened(self, tmp_path):
+        """Reopening an up-to-date database keeps its data as is."""
+        path = str(tmp_path / "outages.db")
+        database = Database(db_path=path, pool_size=1)
+        database.save_schedule("2026-01-15", {"1.1": [{"start": "04:00", "end": "09:00"}]})
+        database.close()
+        
+        database = Database(db_path=path, pool_size=1)
+        try:
+            assert database.get_schedule("1.1", "2026-01-15") == [
+                {"start_time": "04:00", "end_time": "09:00", "type": "base"}
+            ]
+            assert database.get_schedule_bundle("1.1", "2026-01-15")["total_hours_off"] == 5.0
+        finally:
+            database.close()
@@ -0,0 +1,163 @@
+"""
+Unit tests for the schedule text parser.
+
+Run with: pytest tests/test_parser.py -v
+"""
+
+import random
+
+import pytest
+
+from app.core.timeutils import to_minutes
+from app.logic.parser import Parser
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """Create one parser shared by the module's tests."""
+    return Parser()
+
+
+def parse_queue(parser, schedule_text, extras_text="", queue="1.1"):
+    """Parse one block and return the intervals of a single queue as (start, end) pairs."""
+    parsed = parser.parse_block({
+        "date": "2026-01-15",
+        "schedule_text": schedule_text,
+        "extras_text": extras_text,
+    })
+    return [(i["start"], i["end"]) for i in parsed["queues"].get(queue, [])]
+
+
+class TestBaseSchedule:
+    """Tests for parsing base schedule lines."""
+    
+    def test_multiline_schedule(self, parser):
+        """Each queue line should yield its own normalized intervals."""
+        parsed = parser.parse_block({
+            "date": "2026-01-15",
+            "schedule_text": (
+                "підчерга 1.1 – з 04:00 до 09:00;\n"
+                "Підчерга 1.2 – з 6:00 до 11:00, з 18:00 до 23:00;\n"
+                "примітка без черги з 01:00 до 02:00\n"
+            ),
+            "extras_text": "",
+        })
+        
+        assert parsed["message"] is None
+        assert {q: [(i["start"], i["end"]) for i in v] for q, v in parsed["queues"].items()} == {
+            "1.1": [("04:00", "09:00")],
+            "1.2": [("06:00", "11:00"), ("18:00", "23:00")],
+        }
+    
+    def test_times_before_queue_label(self, parser):
+        """Times anywhere on the queue's line should be read."""
+        assert parse_queue(parser, "з 04:00 до 09:00 – підчерга 1.1") == [("04:00", "09:00")]
+    
+    def test_queue_label_split_across_lines(self, parser):
+        """A queue number on the next line doesn't belong to the label (per-line parsing)."""
+        assert parse_queue(parser, "Підчерга\n1.1 – з 04:00 до 09:00") == []
+
+
+class TestChangeApplication:
+    """Tests for applying start/end changes to the nearest base interval."""
+    
+    def test_extended_end_moves_nearest_end(self, parser):
+        """Extended end should move the end of the closest interval."""
+        intervals = parse_queue(
+            parser,
+            "підчерга 1.1 – з 04:00 до 09:00, з 14:00 до 18:00",
+            "Для підчерги 1.1 відключення триватиме довше – до 19:00",
+        )
+        assert intervals == [("04:00", "09:00"), ("14:00", "19:00")]
+    
+    def test_extended_end_with_overnight_interval(self, parser):
+        """Ends needn't be sorted: an overnight interval ends before the one preceding it."""
+        intervals = parse_queue(
+            parser,
+            "підчерга 1.1 – з 10:00 до 12:00, з 22:00 до 02:00",
+            "Для підчерги 1.1 відключення триватиме довше – до 02:30",
+        )
+        assert intervals == [("10:00", "12:00"), ("22:00", "02:30")]
+    
+    def test_early_start_moves_nearest_start(self, parser):
+        """Earlier start should move the start of the closest interval."""
+        intervals = parse_queue(
+            parser,
+            "підчерга 1.1 – з 04:00 до 09:00, з 14:00 до 18:00",
+            "Для підчерги 1.1 відключення розпочнеться раніше – о 13:00",
+        )
+        assert intervals == [("04:00", "09:00"), ("13:00", "18:00")]
+    
+    def test_full_change_merges_with_base(self, parser):
+        """Full change should merge with the base interval it overlaps."""
+        intervals = parse_queue(
+            parser,
+            "підчерга 1.1 – з 10:00 до 15:00, з 20:00 до 22:00",
+            "Для підчерги 1.1 відключення розпочнеться раніше – об 09:00 і триватиме до 16:00",
+        )
+        assert intervals == [("09:00", "16:00"), ("20:00", "22:00")]
+    
+    def test_extra_outage_merged_and_sorted(self, parser):
+        """Extra outages should merge with overlapping intervals and keep order."""
+        intervals = parse_queue(
+            parser,
+            "підчерга 1.1 – з 14:00 до 18:00, з 04:00 до 09:00",
+            "Для підчерги 1.1 додатково буде знеструмлено з 08:00 до 10:00",
+        )
+        assert intervals == [("04:00", "10:00"), ("14:00", "18:00")]
+    
+    def test_extra_outage_added_between_intervals(self, parser):
+        """A non-overlapping extra outage becomes its own interval."""
+        intervals = parse_queue(
+            parser,
+            "підчерга 1.1 – з 04:00 до 09:00, з 14:00 до 18:00",
+            "Для підчерги 1.1 додатково буде знеструмлено з 11:00 до 12:00",
+        )
+        assert intervals == [("04:00", "09:00"), ("11:00", "12:00"), ("14:00", "18:00")]
+    
+    def test_change_keywords_are_case_insensitive(self, parser):
+        """Upper-case change wording should still be applied."""
+        intervals = parse_queue(
+            parser,
+            "підчерга 1.1 – з 04:00 до 09:00",
+            "ДЛЯ ПІДЧЕРГИ 1.1 ВІДКЛЮЧЕННЯ ТРИВАТИМЕ ДОВШЕ – ДО 11:00",
+        )
+        assert intervals == [("04:00", "11:00")]
+    
+    def test_extras_without_changes_keep_base(self, parser):
+        """Extras without change wording are kept as the message only."""
+        extras = "Укренерго повідомляє про застосування графіків для підчерги 1.1"
+        parsed = parser.parse_block({
+            "date": "2026-01-15",
+            "schedule_text": "підчерга 1.1 – з 04:00 до 09:00",
+            "extras_text": extras,
+        })
+        
+        assert parsed["message"] == extras
+        assert [(i["start"], i["end"]) for i in parsed["queues"]["1.1"]] == [("04:00", "09:00")]
+
+
+class TestMergeOverlapping:
+    """Tests for merging (start, end) minute pairs."""
+    
+    def test_matches_minute_coverage(self, parser):
+        """Merged output should cover exactly the minutes of the input (seeded random cases)."""
+        rng = random.Random(0)
+        for _ in range(500):
+            pairs = []
+            for _ in range(rng.randint(1, 6)):
+                start = rng.randrange(0, 24 * 60, 15)
+                pairs.append((start, rng.randrange(start + 15, 24 * 60 + 1, 15)))
+            
+            covered = set()
+            for start, end in pairs:
+                covered.update(range(start, end))
+            expected = []
+            for minute in sorted(covered):
+                if expected and expected[-1][1] == minute:
+                    expected[-1][1] = minute + 1
+                else:
+                    expected.append([minute, minute + 1])
+            
+            merged = parser._merge_overlapping(list(pairs))
+            assert [[to_minutes(i["start"]), to_minutes(i["end"])] for i in merged] == expected, pairs
@@ -0,0 +1,122 @@
+"""
+Unit tests for schedule block extraction from the hoe.com.ua page.
+
+Uses small HTML fixtures shaped like the real page; no network access.
+Run with: pytest tests/test_scraper.py -v
+"""
+
+import pytest
+
+from app.logic.scraper import Scraper
+
+EXTRAS_DAY_1 = "Для підчерги 1.1 відключення триватиме довше – до 10:00"
+EXTRAS_DAY_2 = "Для підчерги 2.1 додатково буде знеструмлено з 16:00 до 18:00"
+
+# Days separated by <hr>; head and scripts outside the post container
+HR_PAGE = f"""
+<html><head><title>Графіки</title><script>var menu = "підчерга 9.9";</script></head>
+<body>
+<nav><p>{EXTRAS_DAY_2}</p></nav>
+<div class="post">
+    <p>{EXTRAS_DAY_1}</p>
+    <p>Новина без ключових слів</p>
+    <img alt="ГПВ-15.01.26" src="a.png">
+    <p>Електроенергія у підчергах відсутня за графіком:</p>
+    <ul><li>підчерга 1.1 – з 04:00 до 09:00;</li><li>підчерга 1.2 – з 06:00 до 11:00;</li></ul>
+    <hr>
+    <p>{EXTRAS_DAY_2}</p>
+    <img alt="ГПВ-16.01.26" src="b.png">
+    <ul><li>підчерга 2.1 – з 06:00 до 11:00;</li></ul>
+    <ul><li>Список без черг</li></ul>
+    <hr>
+</div>
+</body></html>
+"""
+
+# Date images wrapped in <h2> markers
+H2_PAGE = f"""
+<div class="post">
+    <p>{EXTRAS_DAY_1}</p>
+    <h2><img alt="ГПВ-15.01.26" src="a.png"></h2>
+    <ul><li>підчерга 1.1 – з 04:00 до 09:00;</li></ul>
+    <hr>
+    <p>{EXTRAS_DAY_2}</p>
+    <h2><img alt="ГПВ-16.01.26" src="b.png"></h2>
+    <ul><li>підчерга 2.1 – з 06:00 до 11:00;</li></ul>
+</div>
+"""
+
+# Second date image follows the first day's schedule without an <hr>
+BACK_TO_BACK_PAGE = f"""
+<div class="post">
+    <p>{EXTRAS_DAY_1}</p>
+    <img alt="ГПВ-15.01.26" src="a.png">
+    <ul><li>підчерга 1.1 – з 04:00 до 09:00;</li></ul>
+    <p>{EXTRAS_DAY_2}</p>
+    <img alt="ГПВ-16.01.26" src="b.png">
+    <ul><li>підчерга 2.1 – з 06:00 до 11:00;</li></ul>
+</div>
+"""
+
+
+@pytest.fixture(scope="module")
+def scraper():
+    """Create one scraper shared by the module's tests."""
+    scraper = Scraper()
+    yield scraper
+    scraper.close()
+
+
+class TestExtractBlocks:
+    """Tests for Scraper.extract_blocks()."""
+    
+    def test_hr_separated_days(self, scraper):
+        """Each day gets its own schedule and the extras preceding its image."""
+        assert scraper.extract_blocks(HR_PAGE) == [
+            {
+                "date": "2026-01-15",
+                "schedule_text": "підчерга 1.1 – з 04:00 до 09:00;\nпідчерга 1.2 – з 06:00 до 11:00;\n",
+                "extras_text": EXTRAS_DAY_1,
+            },
+            {
+                "date": "2026-01-16",
+                "schedule_text": "підчерга 2.1 – з 06:00 до 11:00;\n",
+                "extras_text": EXTRAS_DAY_2,
+            },
+        ]
+    
+    def test_h2_wrapped_markers(self, scraper):
+        """An <img> inside a marker <h2> is one marker; extras don't leak into the next day."""
+        blocks = scraper.extract_blocks(H2_PAGE)
+        
+        assert [b["date"] for b in blocks] == ["2026-01-15", "2026-01-16"]
+        assert [b["extras_text"] for b in blocks] == [EXTRAS_DAY_1, EXTRAS_DAY_2]
+        assert blocks[1]["schedule_text"] == "підчерга 2.1 – з 06:00 до 11:00;\n"
+    
+    def test_back_to_back_date_images(self, scraper):
+        """Without an <hr>, the next image ends the schedule; its extras start after the previous image."""
+        blocks = scraper.extract_blocks(BACK_TO_BACK_PAGE)
+        
+        assert [b["schedule_text"] for b in blocks] == [
+            "підчерга 1.1 – з 04:00 до 09:00;\n",
+            "підчерга 2.1 – з 06:00 до 11:00;\n",
+        ]
+        assert [b["extras_text"] for b in blocks] == [EXTRAS_DAY_1, EXTRAS_DAY_2]
+    
+    @pytest.mark.parametrize("alt, expected", [
+        ("ГПВ-15.01.26", "2026-01-15"),
+        ("Графік ГПВ-15.01.2026 оновлено", "2026-01-15"),
+    ])
+    def test_date_from_image_alt(self, scraper, alt, expected):
+        """Date is read from anywhere in the alt text, with 2- or 4-digit years."""
+        html = f'<article><img alt="{alt}"><ul><li>підчерга 1.1 – з 04:00 до 09:00</li></ul></article>'
+        assert [b["date"] for b in scraper.extract_blocks(html)] == [expected]
+    
+    def test_images_without_date_ignored(self, scraper):
+        """Images without a ГПВ date don't start a block."""
+        html = '<div class="post"><img alt="Логотип"><ul><li>підчерга 1.1 – з 04:00 до 09:00</li></ul></div>'
+        assert scraper.extract_blocks(html) == []
+    
+    def test_no_content_container(self, scraper):
+        """Pages without a post container or article yield no blocks."""
+        assert scraper.extract_blocks("<html><body><p>Сторінку не знайдено</p></body></html>") == []